@@ -4,7 +4,8 @@ from sqlmodel import Session
 
 from api.deps import get_db, get_fav_ids
 from schemas.album import AlbumsListResponse, AlbumDetail
-from services import album_service
+from services import album_service, sections_service
+from services.album_tree import album_tree
 from repositories import album_repo
 
 router = APIRouter(prefix="/albums", tags=["Albums"])
@@ -48,4 +49,6 @@ def set_album_excluded(
     album = album_repo.set_excluded(session, album_id, body.excluded)
     if not album:
         raise HTTPException(status_code=404, detail="Album not found")
+    album_tree.invalidate()
+    sections_service.rebuild_sections(session)
     return {"id": album.id, "name": album.name, "excluded": album.excluded}
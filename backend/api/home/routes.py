@@ -3,7 +3,7 @@ from sqlmodel import Session
 from typing import List
 
 from api.deps import get_db
-from schemas.home_feed import HomeFeedResponse
+from schemas.home_feed import HomeFeedResponse, TimelineResponse
 from schemas.photo import PhotoResponse
 from services import home_feed_service, slideshow_service
 
@@ -15,6 +15,12 @@ def home_feed(session: Session = Depends(get_db)):
     return home_feed_service.get_home_feed(session)
 
 
+@router.get("/timeline", response_model=TimelineResponse)
+def timeline(session: Session = Depends(get_db)):
+    """Photo counts per year (oldest first) for scrubbing the timeline."""
+    return home_feed_service.get_timeline(session)
+
+
 @router.get("/slideshow", response_model=List[PhotoResponse])
 def slideshow(session: Session = Depends(get_db)):
     """
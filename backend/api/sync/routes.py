@@ -1,20 +1,41 @@
 """
 Sync endpoints: trigger Google Drive → DB synchronisation.
+
+Syncs run as background jobs (services/sync_jobs.py): triggering one returns
+the job at once, and its progress is polled via GET /sync/jobs/{id}.
 """
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
+from fastapi import APIRouter, HTTPException
 
-from api.deps import get_db
-from services.sync_service import sync_root
+from schemas.sync import SyncJobListResponse, SyncJobResponse
+from services.sync_jobs import sync_jobs
 
 router = APIRouter(prefix="/sync", tags=["Sync"])
 
 
-@router.post("/drive")
-def trigger_sync(session: Session = Depends(get_db)):
+@router.post("/drive", response_model=SyncJobResponse, status_code=202)
+def trigger_sync(incremental: bool = False, force: bool = False):
     """
-    Manually trigger a full Google Drive sync.
-    Returns a summary of what was synced.
+    Enqueue a Google Drive sync — a full rescan by default, or with
+    ?incremental=true only the changes since the last run.
+    A full rescan skips folders unchanged since they were last listed;
+    ?force=true relists everything.
+    Only one sync runs at a time: if one is already queued or running, that
+    job is returned instead.
     """
-    result = sync_root(session)
-    return result
+    job, _ = sync_jobs.submit("incremental" if incremental else "full", force=force)
+    return job.to_dict()
+
+
+@router.get("/jobs", response_model=SyncJobListResponse)
+def list_sync_jobs():
+    """Recent sync jobs, newest first."""
+    return {"jobs": [job.to_dict() for job in sync_jobs.list()]}
+
+
+@router.get("/jobs/{job_id}", response_model=SyncJobResponse)
+def get_sync_job(job_id: str):
+    """Status and progress of a sync job (folders done, photos, errors, ETA)."""
+    job = sync_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job.to_dict()
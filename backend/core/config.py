@@ -43,6 +43,62 @@ class Settings(BaseSettings):
     # If empty, tokens are stored base64-only (local dev only — NOT safe for prod).
     token_encryption_key: str = ""
 
+    # Media derivatives (rendered thumbnails / previews) cached on local disk.
+    # Keyed by Drive modifiedTime, so edits in Drive invalidate automatically.
+    derivative_cache_dir: str = "./data/derivatives"
+    derivative_cache_max_mb: int = 2048
+    # Chunk size for media proxied straight from Drive (stream/download/content)
+    drive_stream_chunk_kb: int = 256
+    # Connect / between-bytes read timeouts for those streams, so a stalled
+    # Drive connection releases its worker thread
+    drive_stream_connect_timeout_seconds: float = 10.0
+    drive_stream_read_timeout_seconds: float = 30.0
+    # In-memory LRU of recently downloaded originals (0 MB disables it)
+    originals_cache_mb: int = 256
+    originals_cache_ttl_seconds: int = 600
+
+    # Image transcoding process pool (0 workers = one per CPU core).
+    # Requests beyond workers + queue size get 503 with Retry-After.
+    transcode_workers: int = 0
+    transcode_queue_size: int = 32
+    transcode_timeout_seconds: float = 30.0
+    transcode_retry_after_seconds: int = 2
+
+    # Post-sync warm-up: pre-render the grid thumbnail + lightbox preview for
+    # photos whose derivatives are missing (newest modifiedTime first).
+    # Each run handles at most sync_warm_max_per_run photos; the rest are
+    # picked up by the next sync.
+    sync_warm_derivatives: bool = False
+    sync_warm_workers: int = 4
+    sync_warm_max_per_run: int = 500
+
+    # Full sync lists this many Drive folders concurrently
+    sync_concurrency: int = 8
+    # Folder levels below root a full sync lists (1 = top-level albums only).
+    # Raise it for deep year/month/day hierarchies.
+    sync_max_depth: int = 3
+    # Photos/albums removed from Drive are tombstoned, then hard-deleted
+    # after this many days
+    tombstone_retention_days: int = 30
+
+    # Drive HTTP transport: keep-alive pool for direct media requests, and the
+    # socket timeout for API calls
+    drive_http_pool_size: int = 16
+    drive_http_timeout_seconds: float = 60.0
+
+    # Drive API quota governor: token buckets per operation class, in calls
+    # per second (0 = unlimited).  Buckets hold burst_seconds worth of calls;
+    # background work (sync, warm-up) can't use the interactive reserve share.
+    # Drive allows 12,000 queries/min (200/s) per user; the defaults add up to
+    # 180/s so the governor only smooths sustained load below that ceiling.
+    # A grid load's cache misses fit in the metadata burst without waiting,
+    # which matters because every waiting request holds a threadpool thread.
+    drive_quota_list_per_sec: float = 20.0
+    drive_quota_media_per_sec: float = 60.0
+    drive_quota_metadata_per_sec: float = 100.0
+    drive_quota_burst_seconds: float = 5.0
+    drive_quota_interactive_reserve: float = 0.5
+
     # AI (optional, all off by default)
     openai_api_key: Optional[str] = None
     ai_enabled: bool = False
@@ -28,6 +28,19 @@ def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 
+def dialect_insert(session: Session):
+    """
+    The dialect-specific insert() construct for the session's engine, which
+    (unlike the generic one) supports on_conflict_do_update for bulk upserts.
+    """
+    name = session.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
 def get_session():
     with Session(engine) as session:
         yield session
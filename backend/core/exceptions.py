@@ -8,3 +8,7 @@ class DriveError(Exception):
 
 class NotFoundError(Exception):
     """Resource not found."""
+
+
+class ChangesTokenInvalid(DriveError):
+    """Raised when a stored Drive Changes page token is rejected (expired/invalid)."""
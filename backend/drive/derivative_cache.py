@@ -0,0 +1,160 @@
+"""
+On-disk cache for rendered image derivatives (thumbnails, previews).
+
+Entries are content-addressed: the file name is a hash of
+(file_id, modifiedTime, kind, size, quality), so a Drive edit produces a new
+key and stale renders simply age out.  The cache is bounded by total bytes and
+evicts least-recently-used files first (recency is tracked via file mtime so
+it survives restarts).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".jpg"
+
+
+def normalize_version(modified: Union[str, datetime, None]) -> str:
+    """
+    Canonical string for a Drive modifiedTime.
+
+    Accepts the RFC 3339 string Drive returns ("2024-05-01T10:00:00.000Z") or a
+    datetime read back from the DB (naive datetimes are treated as UTC), so the
+    HTTP handlers and the sync pipeline derive identical cache keys.
+    """
+    if modified is None:
+        return ""
+    if isinstance(modified, str):
+        try:
+            modified = datetime.fromisoformat(modified.replace("Z", "+00:00"))
+        except ValueError:
+            return modified
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=timezone.utc)
+    return modified.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def derivative_key(
+    file_id: str,
+    modified: Union[str, datetime, None],
+    kind: str,
+    size: int,
+    quality: int,
+) -> str:
+    raw = f"{file_id}|{normalize_version(modified)}|{kind}|{size}|{quality}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class DerivativeCache:
+    """Size-bounded LRU of derivative files under a single directory."""
+
+    def __init__(self, root: Union[str, Path], max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> bytes
+        self._total = 0
+        self._loaded = False
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _path(self, key: str) -> Path:
+        # Two-level fan-out keeps directory listings small
+        return self.root / key[:2] / f"{key}{_SUFFIX}"
+
+    def _ensure_loaded(self) -> None:
+        """Index existing files once, oldest-first, so LRU order survives restarts."""
+        if self._loaded:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        found: list[tuple[float, str, int]] = []
+        for path in self.root.glob(f"*/*{_SUFFIX}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            found.append((st.st_mtime, path.stem, st.st_size))
+        found.sort()
+        for _, key, size in found:
+            self._entries[key] = size
+            self._total += size
+        self._loaded = True
+        self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._total > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("[derivatives] eviction failed key=%s error=%s", key, e)
+
+    # ── public API ────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the path of a cached derivative (and mark it recent), or None."""
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._entries:
+                return None
+            path = self._path(key)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # Removed behind our back — forget it
+                self._total -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return path
+
+    def contains(self, key: str) -> bool:
+        """Membership check that does not affect LRU order."""
+        with self._lock:
+            self._ensure_loaded()
+            return key in self._entries
+
+    def put(self, key: str, data: bytes) -> Path:
+        """Atomically write a derivative and evict down to the size budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._entries:
+                self._total -= self._entries.pop(key)
+            self._entries[key] = len(data)
+            self._total += len(data)
+            self._evict_locked()
+        return path
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+            }
+
+
+derivative_cache = DerivativeCache(
+    settings.derivative_cache_dir,
+    settings.derivative_cache_max_mb * 1024 * 1024,
+)
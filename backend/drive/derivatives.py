@@ -0,0 +1,252 @@
+"""
+Derivative production for the media proxy (thumbnails and lightbox previews).
+
+Thumbnails are resolved through tiers, cheapest first:
+  1. cache       — already rendered, served from the on-disk derivative cache
+  2. drive       — Drive's own server-side rendition via the file's thumbnailLink
+  3. transcode   — download the original and resize it with Pillow in the
+                   process pool (drive/transcoder.py)
+
+Previews always use the cache → transcode path.  Every tier outcome is counted
+so /drive/stats shows how often the expensive path is taken.
+
+Concurrent work is coalesced: requests for the same derivative share one
+render, and renders of different derivatives of the same file share one
+download of the original (e.g. a grid thumbnail and a lightbox preview opened
+together, or many clients hitting the same hero photo).
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from googleapiclient.errors import HttpError
+
+from google_drive_client import get_authorized_session
+from .derivative_cache import derivative_cache, derivative_key
+from .image_utils import render_preview, render_thumbnail
+from .quota import is_rate_limited, quota
+from .service import download_file_bytes
+from .singleflight import SingleFlight
+from .transcoder import transcoder, TranscoderBusy, TranscodeTimeout
+
+logger = logging.getLogger(__name__)
+
+# JPEG quality per derivative kind (part of the cache key)
+KIND_QUALITY = {"thumbnail": 80, "preview": 85}
+
+_THUMB_SIZE_RE = re.compile(r"=s\d+(-[a-z0-9-]+)?$")
+
+# In-flight coalescing: originals by file_id, renders by derivative key
+_downloads = SingleFlight()
+_renders = SingleFlight()
+
+_tier_lock = threading.Lock()
+_tier_counts: dict[str, int] = {
+    "cache": 0,
+    "drive": 0,
+    "drive_miss": 0,
+    "transcode": 0,
+}
+
+
+class Derivative(NamedTuple):
+    """A rendered derivative: either a cached file path or fresh bytes."""
+    path: Optional[Path]
+    data: Optional[bytes]
+    tier: str
+
+
+class DerivativeRenderError(Exception):
+    """Raised when the original could not be decoded or resized."""
+
+
+def _count(tier: str) -> None:
+    with _tier_lock:
+        _tier_counts[tier] = _tier_counts.get(tier, 0) + 1
+
+
+def tier_stats() -> dict:
+    with _tier_lock:
+        return dict(_tier_counts)
+
+
+def coalescing_stats() -> dict:
+    return {"downloads": _downloads.stats(), "renders": _renders.stats()}
+
+
+def _download_with_retry(
+    svc,
+    file_id: str,
+    version: Optional[str] = None,
+    max_attempts: int = 3,
+) -> bytes:
+    """
+    Download file bytes from Drive with retry on transient errors (429, 500, 503).
+    Raises HttpError if all attempts fail.
+    """
+    last_exc = None
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return download_file_bytes(svc, file_id, version)
+        except HttpError as e:
+            status = e.resp.status if hasattr(e, 'resp') else 0
+            if is_rate_limited(e):
+                quota.throttled("media")
+            if status in (429, 500, 503) and attempt < max_attempts:
+                wait = 2 ** (attempt - 1)  # 1s, 2s backoff
+                logger.warning(
+                    "[drive] transient error %s for file_id=%s attempt=%d/%d — retrying in %ds",
+                    status, file_id, attempt, max_attempts, wait,
+                )
+                time.sleep(wait)
+                last_exc = e
+                continue
+            raise
+    raise last_exc  # type: ignore[misc]
+
+
+def sniff_format(header: bytes) -> str:
+    """Return a quick file-format hint from the first 16 bytes (for logging)."""
+    if header[:4] == b'\x00\x00\x00\x18' or header[4:8] in (b'ftyp', b'heic', b'heix', b'mif1'):
+        return "heic/heif"
+    if header[:8] == b'\x89PNG\r\n\x1a\n':
+        return "png"
+    if header[:3] == b'\xff\xd8\xff':
+        return "jpeg"
+    if header[:4] in (b'RIFF', b'WEBP'):
+        return "webp"
+    if header[:2] in (b'BM',):
+        return "bmp"
+    return f"unknown({header[:4].hex()})"
+
+
+_RENDERERS = {"thumbnail": render_thumbnail, "preview": render_preview}
+
+
+# ── tiers ─────────────────────────────────────────────────────────────────────
+
+def _fetch_drive_thumbnail(link: Optional[str], size: int) -> Optional[bytes]:
+    """
+    Fetch Drive's server-side rendition at the requested bound (the =s{size}
+    suffix).  Returns None whenever the fast path can't be used so the caller
+    falls back to transcoding.
+    """
+    if not link:
+        return None
+    if _THUMB_SIZE_RE.search(link):
+        sized = _THUMB_SIZE_RE.sub(f"=s{size}", link)
+    else:
+        sized = f"{link}=s{size}"
+    quota.acquire("media")
+    try:
+        resp = get_authorized_session().get(sized, timeout=15)
+    except Exception as e:
+        logger.debug("[drive] thumbnailLink fetch failed error=%s", e)
+        return None
+    if resp.status_code == 429:
+        quota.throttled("media")
+    if resp.status_code != 200:
+        return None
+    if resp.headers.get("Content-Type", "").split(";")[0].strip() != "image/jpeg":
+        return None
+    return resp.content
+
+
+def _transcode(
+    svc,
+    file_id: str,
+    version: Optional[str],
+    kind: str,
+    size: int,
+    quality: int,
+    wait: bool,
+) -> bytes:
+    raw = _downloads.do(file_id, lambda: _download_with_retry(svc, file_id, version))
+    try:
+        return transcoder.run(_RENDERERS[kind], raw, size, quality, wait=wait)
+    except (TranscoderBusy, TranscodeTimeout):
+        raise
+    except Exception as e:
+        logger.error("[drive] %s processing FAILED file_id=%s mime_hint=%s error=%s",
+                     kind, file_id, sniff_format(raw[:16]), e)
+        raise DerivativeRenderError(str(e)) from e
+
+
+def _store(key: str, file_id: str, kind: str, data: bytes) -> None:
+    try:
+        derivative_cache.put(key, data)
+    except OSError as e:
+        # A full or read-only disk must not break image serving
+        logger.warning("[drive] %s cache write FAILED file_id=%s error=%s", kind, file_id, e)
+
+
+def get_cached(file_id: str, modified, kind: str, size: int) -> Optional[Path]:
+    """
+    Cache-only lookup for a derivative whose version (modifiedTime, e.g. from
+    the DB) is already known.  No Drive call; returns None on a miss.
+    """
+    key = derivative_key(file_id, modified, kind, size, KIND_QUALITY[kind])
+    cached = derivative_cache.get(key)
+    if cached is not None:
+        _count("cache")
+    return cached
+
+
+def get_derivative(
+    svc,
+    file_id: str,
+    meta: dict,
+    kind: str,
+    size: int,
+    wait: bool = False,
+) -> Derivative:
+    """
+    Return the requested derivative, rendering and caching it on a miss.
+
+    `meta` is the Drive metadata record (modifiedTime, thumbnailLink).
+    `wait` lets background callers queue for a transcoder slot instead of
+    getting TranscoderBusy.
+    Raises HttpError / DriveMediaError on Drive failures,
+    TranscoderBusy / TranscodeTimeout under load, and
+    DerivativeRenderError when the image can't be processed.
+    """
+    quality = KIND_QUALITY[kind]
+    key = derivative_key(file_id, meta.get("modifiedTime"), kind, size, quality)
+
+    cached = derivative_cache.get(key)
+    if cached is not None:
+        _count("cache")
+        return Derivative(cached, None, "cache")
+
+    return _renders.do(
+        key, lambda: _produce(svc, file_id, meta, kind, size, quality, key, wait)
+    )
+
+
+def _produce(
+    svc,
+    file_id: str,
+    meta: dict,
+    kind: str,
+    size: int,
+    quality: int,
+    key: str,
+    wait: bool,
+) -> Derivative:
+    if kind == "thumbnail":
+        data = _fetch_drive_thumbnail(meta.get("thumbnailLink"), size)
+        if data is not None:
+            _count("drive")
+            _store(key, file_id, kind, data)
+            return Derivative(None, data, "drive")
+        _count("drive_miss")
+
+    data = _transcode(svc, file_id, meta.get("modifiedTime"), kind, size, quality, wait)
+    _count("transcode")
+    _store(key, file_id, kind, data)
+    return Derivative(None, data, "transcode")
@@ -1,4 +1,6 @@
+import math
 from io import BytesIO
+from typing import Optional
 from PIL import Image
 
 # Optional HEIC/HEIF support (for iPhone photos)
@@ -6,11 +8,63 @@ try:
     import pillow_heif
     pillow_heif.register_heif_opener()
 except Exception:
-    pass
+    pillow_heif = None
 
-def open_image(raw: bytes) -> Image.Image:
-    """Open raw bytes as a PIL image."""
+def _heif_reduced(raw: bytes, min_side: int) -> Optional[Image.Image]:
+    """
+    Decode the smallest thumbnail embedded in the HEIF primary image that is
+    still at least min_side on its long edge and has the primary's aspect
+    ratio (iPhone HEICs carry one), so the full 12 MP primary image is never
+    decoded.  Returns None when there is no such thumbnail.
+    """
+    try:
+        heif = pillow_heif.open_heif(BytesIO(raw))
+        primary = heif[heif.primary_index]
+        width, height = primary.size
+        boxes = primary.info.get("thumbnails", [])
+        for index in sorted(range(len(boxes)), key=lambda i: boxes[i]):
+            if not min_side <= boxes[index] < max(width, height):
+                continue
+            thumbnail = primary.get_thumbnail(index)
+            t_width, t_height = thumbnail.size
+            if abs(t_width * height - t_height * width) <= max(width, height):
+                return thumbnail.to_pillow()
+    except Exception:
+        pass
+    return None
+
+def open_image(
+    raw: bytes,
+    max_side: Optional[int] = None,
+    max_width: Optional[int] = None,
+) -> Image.Image:
+    """
+    Open raw bytes as a PIL image.
+
+    When the caller is going to shrink the result (to fit max_side×max_side,
+    or to max_width wide) the decoder is allowed to work at reduced
+    resolution: JPEG via Image.draft() DCT scaling (1/2–1/8), HEIF via an
+    embedded thumbnail.  The decoded image is never smaller than the final
+    target, so output quality is unchanged.
+    """
     img = Image.open(BytesIO(raw))
+
+    factor = 1.0
+    if max_side and max(img.size) > 0:
+        factor = min(factor, max_side / max(img.size))
+    if max_width and img.width > 0:
+        factor = min(factor, max_width / img.width)
+
+    if factor < 1.0:
+        target = (
+            max(1, math.ceil(img.width * factor)),
+            max(1, math.ceil(img.height * factor)),
+        )
+        if img.format == "JPEG":
+            img.draft(None, target)
+        elif img.format in ("HEIF", "HEIC", "AVIF") and pillow_heif is not None:
+            img = _heif_reduced(raw, max(target)) or img
+
     img.load()
     return img
 
@@ -22,3 +76,20 @@ def to_jpeg_bytes(img: Image.Image, quality: int = 85) -> BytesIO:
     img.save(buf, format="JPEG", quality=quality, optimize=True)
     buf.seek(0)
     return buf
+
+# Renderers are module-level (picklable) so drive/transcoder.py can run them
+# in worker processes.
+
+def render_thumbnail(raw: bytes, size: int, quality: int) -> bytes:
+    """Bound the image to size×size and encode as JPEG."""
+    img = open_image(raw, max_side=size)
+    img.thumbnail((size, size))
+    return to_jpeg_bytes(img, quality=quality).getvalue()
+
+def render_preview(raw: bytes, width: int, quality: int) -> bytes:
+    """Downscale the image to at most `width` pixels wide and encode as JPEG."""
+    img = open_image(raw, max_width=width)
+    if img.width > width and img.width > 0:
+        h = round(img.height * (width / img.width))
+        img = img.resize((width, h), Image.LANCZOS)
+    return to_jpeg_bytes(img, quality=quality).getvalue()
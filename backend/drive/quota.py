@@ -0,0 +1,182 @@
+"""
+Process-wide Drive API quota governor.
+
+Sync listings, media downloads and metadata lookups all draw from one Drive
+user quota.  Each call first takes a token from the bucket for its operation
+class:
+
+  list      — files.list / changes.list (sync, folder browsing)
+  media     — downloads, ranged streams, thumbnailLink fetches
+  metadata  — files.get, changes.getStartPageToken
+
+Buckets refill at a steady rate up to a small burst.  Callers are interactive
+by default; code running inside `background()` (sync, derivative warm-up) is
+background and may not dip into the share of each bucket reserved for
+interactive calls, nor take a token while an interactive caller is waiting.
+So a long sync slows down when users are browsing, not the other way round.
+
+When Drive answers 429 / rate-limit 403 anyway, `throttled(op)` empties that
+bucket so every caller backs off together instead of each retrying alone.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from core.config import settings
+
+OPS = ("list", "media", "metadata")
+
+_RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+_local = threading.local()
+
+
+@contextmanager
+def background() -> Iterator[None]:
+    """Mark Drive calls made by this thread as background priority."""
+    previous = getattr(_local, "background", False)
+    _local.background = True
+    try:
+        yield
+    finally:
+        _local.background = previous
+
+
+def is_rate_limited(e) -> bool:
+    """True for an HttpError that is Drive pushing back: 429, or a 403 whose
+    reason is a rate limit (other 403s are permission errors)."""
+    status = e.resp.status if hasattr(e, "resp") else 0
+    if status == 429:
+        return True
+    if status == 403:
+        reasons = {d.get("reason") for d in (getattr(e, "error_details", None) or []) if isinstance(d, dict)}
+        return bool(reasons & set(_RATE_LIMIT_REASONS)) or any(r in str(e) for r in _RATE_LIMIT_REASONS)
+    return False
+
+
+def is_rate_limited_response(status: int, body: str) -> bool:
+    """is_rate_limited for a raw HTTP response: 429, or a 403 whose JSON
+    error.errors[].reason is a rate limit."""
+    if status == 429:
+        return True
+    if status != 403:
+        return False
+    try:
+        errors = json.loads(body).get("error", {}).get("errors") or []
+    except (ValueError, AttributeError):
+        return False
+    return any(isinstance(d, dict) and d.get("reason") in _RATE_LIMIT_REASONS for d in errors)
+
+
+def _priority() -> str:
+    return "background" if getattr(_local, "background", False) else "interactive"
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: float, reserve: float):
+        self.rate = rate
+        self.capacity = max(burst, 1.0)
+        self.reserve = min(reserve, self.capacity - 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.interactive_waiting = 0
+        self.acquired = {"interactive": 0, "background": 0}
+        self.wait_seconds = {"interactive": 0.0, "background": 0.0}
+        self.max_wait = {"interactive": 0.0, "background": 0.0}
+        self.throttled = 0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def floor(self, priority: str) -> float:
+        """Tokens that must remain after a take at this priority."""
+        return 0.0 if priority == "interactive" else self.reserve
+
+
+class QuotaGovernor:
+    def __init__(self, rates: dict[str, float], burst_seconds: float, interactive_reserve: float):
+        self._cond = threading.Condition()
+        self._buckets = {
+            op: _Bucket(rate, rate * burst_seconds, rate * burst_seconds * interactive_reserve)
+            for op, rate in rates.items()
+        }
+
+    def acquire(self, op: str) -> float:
+        """
+        Block until a token for `op` is available at the calling thread's
+        priority.  Returns the seconds spent waiting.
+        """
+        bucket = self._buckets.get(op)
+        if bucket is None or bucket.rate <= 0:
+            return 0.0  # unlimited
+        priority = _priority()
+        started = time.monotonic()
+        with self._cond:
+            registered = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    blocked = priority == "background" and bucket.interactive_waiting
+                    needed = 1.0 + bucket.floor(priority)
+                    if not blocked and bucket.tokens >= needed:
+                        bucket.tokens -= 1.0
+                        break
+                    if priority == "interactive" and not registered:
+                        bucket.interactive_waiting += 1
+                        registered = True
+                    shortfall = max(needed - bucket.tokens, 0.0) or 1.0
+                    self._cond.wait(timeout=shortfall / bucket.rate)
+            finally:
+                if registered:
+                    bucket.interactive_waiting -= 1
+                    self._cond.notify_all()
+
+            waited = time.monotonic() - started
+            bucket.acquired[priority] += 1
+            bucket.wait_seconds[priority] += waited
+            bucket.max_wait[priority] = max(bucket.max_wait[priority], waited)
+        return waited
+
+    def throttled(self, op: str) -> None:
+        """Record a 429 / rate-limit 403 and drain the bucket."""
+        bucket = self._buckets.get(op)
+        if bucket is None:
+            return
+        with self._cond:
+            bucket.throttled += 1
+            bucket.refill(time.monotonic())
+            bucket.tokens = 0.0
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            result = {}
+            for op, bucket in self._buckets.items():
+                bucket.refill(now)
+                result[op] = {
+                    "rate_per_sec": bucket.rate,
+                    "tokens": round(bucket.tokens, 2),
+                    "capacity": bucket.capacity,
+                    "acquired": dict(bucket.acquired),
+                    "wait_seconds": {k: round(v, 3) for k, v in bucket.wait_seconds.items()},
+                    "max_wait_seconds": {k: round(v, 3) for k, v in bucket.max_wait.items()},
+                    "throttled": bucket.throttled,
+                }
+            return result
+
+
+quota = QuotaGovernor(
+    rates={
+        "list": settings.drive_quota_list_per_sec,
+        "media": settings.drive_quota_media_per_sec,
+        "metadata": settings.drive_quota_metadata_per_sec,
+    },
+    burst_seconds=settings.drive_quota_burst_seconds,
+    interactive_reserve=settings.drive_quota_interactive_reserve,
+)
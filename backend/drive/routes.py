@@ -1,48 +1,46 @@
 # backend/drive/routes.py
 
 from typing import Optional
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
 import os
 import logging
-import time
 import mimetypes
-from io import BytesIO
 
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import StreamingResponse, Response
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from googleapiclient.errors import HttpError
-from PIL import Image
+from sqlmodel import Session
 
 from config import ROOT_FOLDER_ID as CONFIG_ROOT_ID
-from .service import get_drive_service, download_file_bytes, ReauthRequired
-from .image_utils import open_image, to_jpeg_bytes
+from core.database import engine
+from repositories import photo_repo
+from .service import (
+  get_drive_service,
+  get_file_metadata,
+  open_media,
+  iter_media,
+  originals_cache,
+  DriveMediaError,
+  ReauthRequired,
+)
+from .derivatives import (
+  KIND_QUALITY,
+  get_cached,
+  get_derivative,
+  tier_stats,
+  coalescing_stats,
+  DerivativeRenderError,
+)
+from .derivative_cache import derivative_cache, normalize_version
+from .quota import is_rate_limited, quota
+from .transcoder import transcoder, TranscoderBusy, TranscodeTimeout
 from responses import reauth_json
 
 logger = logging.getLogger(__name__)
 
 
-def _download_with_retry(svc, file_id: str, max_attempts: int = 3) -> bytes:
-    """
-    Download file bytes from Drive with retry on transient errors (429, 500, 503).
-    Raises HttpError if all attempts fail.
-    """
-    last_exc = None
-    for attempt in range(1, max_attempts + 1):
-        try:
-            return download_file_bytes(svc, file_id)
-        except HttpError as e:
-            status = e.resp.status if hasattr(e, 'resp') else 0
-            if status in (429, 500, 503) and attempt < max_attempts:
-                wait = 2 ** (attempt - 1)  # 1s, 2s backoff
-                logger.warning(
-                    "[drive] transient error %s for file_id=%s attempt=%d/%d — retrying in %ds",
-                    status, file_id, attempt, max_attempts, wait,
-                )
-                time.sleep(wait)
-                last_exc = e
-                continue
-            raise
-    raise last_exc  # type: ignore[misc]
-
 router = APIRouter()
 
 # Root Google Drive folder:
@@ -105,24 +103,33 @@ def list_children(parentId: Optional[str] = None):
     "),nextPageToken"
   )
 
-  try:
-    resp = (
-      svc.files()
-      .list(
-        q=q,
-        fields=fields,
-        pageSize=200,
-        supportsAllDrives=True,
-        includeItemsFromAllDrives=True,
-        orderBy="name_natural",
-        spaces="drive",
+  files: list[dict] = []
+  page_token: Optional[str] = None
+  while True:
+    quota.acquire("list")
+    try:
+      resp = (
+        svc.files()
+        .list(
+          q=q,
+          fields=fields,
+          pageSize=1000,
+          pageToken=page_token,
+          supportsAllDrives=True,
+          includeItemsFromAllDrives=True,
+          orderBy="name_natural",
+          spaces="drive",
+        )
+        .execute()
       )
-      .execute()
-    )
-  except HttpError as e:
-    raise HTTPException(status_code=502, detail=f"Drive error: {e}")
-
-  files = resp.get("files", [])
+    except HttpError as e:
+      if is_rate_limited(e):
+        quota.throttled("list")
+      raise HTTPException(status_code=502, detail=f"Drive error: {e}")
+    files.extend(resp.get("files", []))
+    page_token = resp.get("nextPageToken")
+    if not page_token:
+      break
 
   folders: list[dict] = []
   photos: list[dict] = []
@@ -159,12 +166,138 @@ def list_children(parentId: Optional[str] = None):
   }
 
 
+# ---------------------------
+# Conditional GET helpers (ETag / Last-Modified)
+# ---------------------------
+
+def _validators(meta: dict, *variant) -> dict:
+  """
+  ETag + Last-Modified headers for a response derived from a Drive file.
+  The ETag covers the file content (md5Checksum, else modifiedTime) plus the
+  variant parameters (endpoint, size, quality) that shape the response.
+  """
+  version = meta.get("md5Checksum") or meta.get("modifiedTime") or ""
+  raw = "|".join([meta.get("id", ""), version, *map(str, variant)])
+  headers = {"ETag": f'"{hashlib.sha1(raw.encode()).hexdigest()}"'}
+  if meta.get("modifiedTime"):
+    try:
+      modified = datetime.fromisoformat(meta["modifiedTime"].replace("Z", "+00:00"))
+      headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+    except ValueError:
+      pass
+  return headers
+
+
+def _is_not_modified(request: Request, validators: dict) -> bool:
+  """Evaluate If-None-Match (preferred) or If-Modified-Since against validators."""
+  if_none_match = request.headers.get("if-none-match")
+  if if_none_match:
+    etag = validators["ETag"]
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+  if_modified_since = request.headers.get("if-modified-since")
+  last_modified = validators.get("Last-Modified")
+  if if_modified_since and last_modified:
+    try:
+      return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+      return False
+  return False
+
+
+def _not_modified(validators: dict, headers: Optional[dict] = None) -> Response:
+  return Response(status_code=304, headers={**(headers or {}), **validators})
+
+
+# ---------------------------
+# Derivative helpers (thumbnail / preview)
+# ---------------------------
+
+_DERIVATIVE_HEADERS = {"Cache-Control": "public, max-age=31536000"}
+
+
+def _known_version(file_id: str) -> Optional[datetime]:
+  """modifiedTime of a synced, live photo from the DB (None if unknown)."""
+  with Session(engine) as session:
+    photo = photo_repo.get_by_id(session, file_id)
+    return photo.modified_time if photo else None
+
+
+def _derivative_validators(file_id: str, modified, kind: str, size: int) -> dict:
+  """
+  ETag + Last-Modified for a derivative.  Keyed on the normalized
+  modifiedTime (the derivative cache's version), so the DB and Drive
+  metadata paths produce the same validators.
+  """
+  version = normalize_version(modified)
+  return _validators(
+    {"id": file_id, "modifiedTime": f"{version}Z" if version else None},
+    kind, size, KIND_QUALITY[kind],
+  )
+
+
+def _serve_derivative(request: Request, svc, file_id: str, kind: str, size: int):
+  """
+  Serve a derivative from the on-disk cache, rendering it on a miss.
+
+  For a photo the DB already knows, the cache key and validators come from
+  its stored modifiedTime, so a 304 or a cache hit never touches Drive (or
+  the quota).  Drive metadata (modifiedTime / thumbnailLink) is fetched only
+  for unknown photos and cache misses; see drive/derivatives.py for the
+  resolution tiers.  A Drive edit not yet synced is picked up on the next
+  sync.
+  """
+  modified = _known_version(file_id)
+  if modified is not None:
+    validators = _derivative_validators(file_id, modified, kind, size)
+    if _is_not_modified(request, validators):
+      return _not_modified(validators, _DERIVATIVE_HEADERS)
+    cached = get_cached(file_id, modified, kind, size)
+    if cached is not None:
+      # FileResponse only fills in ETag/Last-Modified when absent, so ours win
+      return FileResponse(cached, media_type="image/jpeg", headers={**_DERIVATIVE_HEADERS, **validators})
+
+  try:
+    meta = get_file_metadata(svc, file_id)
+  except HttpError as e:
+    logger.error("[drive] %s metadata FAILED file_id=%s error=%s", kind, file_id, e)
+    raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
+
+  validators = _derivative_validators(file_id, meta.get("modifiedTime"), kind, size)
+  if _is_not_modified(request, validators):
+    return _not_modified(validators, _DERIVATIVE_HEADERS)
+  headers = {**_DERIVATIVE_HEADERS, **validators}
+
+  try:
+    result = get_derivative(svc, file_id, meta, kind, size)
+  except (HttpError, DriveMediaError) as e:
+    logger.error("[drive] %s download FAILED file_id=%s error=%s", kind, file_id, e)
+    raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
+  except TranscoderBusy as e:
+    raise HTTPException(
+      status_code=503,
+      detail="Image service busy, retry shortly",
+      headers={"Retry-After": str(e.retry_after)},
+    )
+  except TranscodeTimeout as e:
+    raise HTTPException(status_code=504, detail=f"{kind} timed out: {e}")
+  except DerivativeRenderError as e:
+    raise HTTPException(status_code=500, detail=f"{kind} failed: {e}")
+
+  logger.debug("[drive] %s OK file_id=%s tier=%s", kind, file_id, result.tier)
+  if result.path is not None:
+    # FileResponse only fills in ETag/Last-Modified when absent, so ours win
+    return FileResponse(result.path, media_type="image/jpeg", headers=headers)
+  return Response(content=result.data, media_type="image/jpeg", headers=headers)
+
+
 # ---------------------------
 # GET /drive/file/{id}/thumbnail?s=600
 # ---------------------------
 
 @router.get("/file/{file_id}/thumbnail")
-def thumbnail(file_id: str, s: int = Query(600, ge=64, le=2000)):
+def thumbnail(request: Request, file_id: str, s: int = Query(600, ge=64, le=2000)):
   """
   Returns a JPEG thumbnail (max size s×s) for a Drive image file.
   Only called for image files — video files have thumbnail_url=None
@@ -172,33 +305,15 @@ def thumbnail(file_id: str, s: int = Query(600, ge=64, le=2000)):
 
   HEIC/HEIF & other formats are handled via open_image(), which should
   be configured with pillow-heif in drive/image_utils.py.
+  Drive's own thumbnailLink rendition is tried before downloading the
+  original; results are cached on disk (see drive/derivatives.py).
   """
   svc, reauth = _ensure_drive()
   if reauth is not None:
     return reauth
 
   logger.debug("[drive] thumbnail request file_id=%s size=%d", file_id, s)
-
-  try:
-    raw = _download_with_retry(svc, file_id)
-  except HttpError as e:
-    logger.error("[drive] thumbnail download FAILED file_id=%s error=%s", file_id, e)
-    raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
-
-  try:
-    img = open_image(raw)
-    img.thumbnail((s, s))
-    jpeg_bytes = to_jpeg_bytes(img, quality=80)
-  except Exception as e:
-    logger.error("[drive] thumbnail processing FAILED file_id=%s error=%s", file_id, e)
-    raise HTTPException(status_code=500, detail=f"thumbnail failed: {e}")
-
-  logger.debug("[drive] thumbnail OK file_id=%s", file_id)
-  return StreamingResponse(
-    jpeg_bytes,
-    media_type="image/jpeg",
-    headers={"Cache-Control": "public, max-age=31536000"},
-  )
+  return _serve_derivative(request, svc, file_id, "thumbnail", s)
 
 
 # ---------------------------
@@ -206,57 +321,79 @@ def thumbnail(file_id: str, s: int = Query(600, ge=64, le=2000)):
 # ---------------------------
 
 @router.get("/file/{file_id}/preview")
-def preview(file_id: str, w: int = Query(1600, ge=400, le=4096)):
+def preview(request: Request, file_id: str, w: int = Query(1600, ge=400, le=4096)):
   """
   Larger JPEG preview for the lightbox.
   Frontend calls previewUrl(photo.id, 1600) for this.
 
   HEIC/HEIF & other formats are handled via open_image().
+  Rendered previews are cached on disk (see drive/derivative_cache.py).
   """
   svc, reauth = _ensure_drive()
   if reauth is not None:
     return reauth
 
   logger.debug("[drive] preview request file_id=%s width=%d", file_id, w)
+  return _serve_derivative(request, svc, file_id, "preview", w)
 
+
+# ---------------------------
+# GET /drive/stats
+# ---------------------------
+
+@router.get("/stats")
+def media_stats():
+  """
+  Internal counters for the media proxy: derivative cache, thumbnail tiers,
+  request coalescing, the transcoder pool, the in-memory originals LRU and
+  the Drive quota governor (waits and 429s per operation class).
+  """
+  return {
+    "derivative_cache": derivative_cache.stats(),
+    "thumbnail_tiers": tier_stats(),
+    "coalescing": coalescing_stats(),
+    "originals": originals_cache.stats(),
+    "transcoder": transcoder.stats(),
+    "quota": quota.stats(),
+  }
+
+
+def _stream_original(
+  request: Request,
+  svc,
+  file_id: str,
+  variant: str,
+  media_type: Optional[str] = None,
+):
+  """
+  Pipe a file's original bytes from Drive to the client as they arrive.
+  Content-Length comes from the metadata so browsers can show progress.
+  Originals recently pulled for a thumbnail/preview are served from memory,
+  and a matching conditional request is answered with 304 without any download.
+  """
   try:
-    raw = _download_with_retry(svc, file_id)
+    meta = get_file_metadata(svc, file_id)
   except HttpError as e:
-    logger.error("[drive] preview download FAILED file_id=%s error=%s", file_id, e)
     raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
 
-  try:
-    img = open_image(raw)
-    if img.width > w and img.width > 0:
-      h = round(img.height * (w / img.width))
-      img = img.resize((w, h), Image.LANCZOS)
-    jpeg_bytes = to_jpeg_bytes(img, quality=85)
-  except Exception as e:
-    logger.error("[drive] preview processing FAILED file_id=%s mime_hint=%s error=%s",
-                 file_id, _sniff_format(raw[:16]), e)
-    raise HTTPException(status_code=500, detail=f"preview failed: {e}")
-
-  logger.debug("[drive] preview OK file_id=%s", file_id)
-  return StreamingResponse(
-    jpeg_bytes,
-    media_type="image/jpeg",
-    headers={"Cache-Control": "public, max-age=31536000"},
-  )
+  validators = _validators(meta, variant)
+  if _is_not_modified(request, validators):
+    return meta, _not_modified(validators)
+
+  media_type = media_type or meta.get("mimeType", "application/octet-stream")
+  headers = dict(validators)
+  cached = originals_cache.get(file_id, meta.get("modifiedTime") or "")
+  if cached is not None:
+    return meta, Response(content=cached, media_type=media_type, headers=headers)
 
+  try:
+    resp = open_media(file_id)
+  except DriveMediaError as e:
+    raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
 
-def _sniff_format(header: bytes) -> str:
-  """Return a quick file-format hint from the first 16 bytes (for logging)."""
-  if header[:4] == b'\x00\x00\x00\x18' or header[4:8] in (b'ftyp', b'heic', b'heix', b'mif1'):
-    return "heic/heif"
-  if header[:8] == b'\x89PNG\r\n\x1a\n':
-    return "png"
-  if header[:3] == b'\xff\xd8\xff':
-    return "jpeg"
-  if header[:4] in (b'RIFF', b'WEBP'):
-    return "webp"
-  if header[:2] in (b'BM',):
-    return "bmp"
-  return f"unknown({header[:4].hex()})"
+  if meta.get("size"):
+    headers["Content-Length"] = str(meta["size"])
+  return meta, StreamingResponse(iter_media(resp), media_type=media_type, headers=headers)
 
 
 # ---------------------------
@@ -264,7 +401,7 @@ def _sniff_format(header: bytes) -> str:
 # ---------------------------
 
 @router.get("/file/{file_id}/content")
-def file_content(file_id: str):
+def file_content(request: Request, file_id: str):
   """
   Raw file bytes. Your frontend uses this as a fallback src in some cases.
   """
@@ -272,15 +409,10 @@ def file_content(file_id: str):
   if reauth is not None:
     return reauth
 
-  try:
-    raw = download_file_bytes(svc, file_id)
-  except HttpError as e:
-    raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
-
-  return StreamingResponse(
-    BytesIO(raw),
-    media_type="application/octet-stream",
+  _, response = _stream_original(
+    request, svc, file_id, "content", media_type="application/octet-stream",
   )
+  return response
 
 
 # ---------------------------
@@ -288,7 +420,7 @@ def file_content(file_id: str):
 # ---------------------------
 
 @router.get("/file/{file_id}/download")
-def download(file_id: str):
+def download(request: Request, file_id: str):
   """
   Download the original file (used by the Download button in Gallery).
   """
@@ -296,79 +428,100 @@ def download(file_id: str):
   if reauth is not None:
     return reauth
 
-  try:
-    meta = svc.files().get(fileId=file_id, fields="name,mimeType").execute()
-    raw = download_file_bytes(svc, file_id)
-  except HttpError as e:
-    raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
-
+  meta, response = _stream_original(request, svc, file_id, "download")
   filename = meta.get("name", "download")
-  mime = meta.get("mimeType", "application/octet-stream")
-
-  return StreamingResponse(
-    BytesIO(raw),
-    media_type=mime,
-    headers={
-      "Content-Disposition": f'attachment; filename="{filename}"'
-    },
-  )
+  response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+  return response
 
 
 # ---------------------------
 # GET /drive/file/{id}/stream
 # ---------------------------
 
+def _parse_range(range_header: str, total: int) -> tuple[int, int]:
+  """
+  Parse a single "bytes=start-end" / "bytes=start-" / "bytes=-suffix" range
+  into an inclusive (start, end) pair clamped to the file size.
+  """
+  try:
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+      raise ValueError(range_header)
+    start_str, end_str = (part.strip() for part in spec.split("-", 1))
+    if start_str:
+      start = int(start_str)
+      end = int(end_str) if end_str else total - 1
+    else:
+      # Suffix range: last N bytes
+      start = max(total - int(end_str), 0)
+      end = total - 1
+  except Exception:
+    raise HTTPException(status_code=400, detail="Invalid Range header")
+
+  if start >= total or start > end:
+    raise HTTPException(
+      status_code=416,
+      detail="Requested range not satisfiable",
+      headers={"Content-Range": f"bytes */{total}"},
+    )
+  return start, min(end, total - 1)
+
+
 @router.get("/file/{file_id}/stream")
 def stream_video(file_id: str, request: Request):
   """
   Stream a video file with HTTP range request support so browsers can
   seek, scrub, and play without downloading the whole file first.
+
+  The client's Range is forwarded to Drive and the body is piped through in
+  fixed-size chunks, so each request costs O(range) transfer and constant
+  memory regardless of the video's size.
   """
   svc, reauth = _ensure_drive()
   if reauth is not None:
     return reauth
 
   try:
-    meta = svc.files().get(fileId=file_id, fields="name,mimeType,size").execute()
-    raw = download_file_bytes(svc, file_id)
+    meta = get_file_metadata(svc, file_id)
   except HttpError as e:
     raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
 
   mime = meta.get("mimeType", "video/mp4")
-  total = len(raw)
+  total = int(meta.get("size") or 0)
+  validators = _validators(meta, "stream")
+  headers = {
+    "Accept-Ranges": "bytes",
+    "Cache-Control": "public, max-age=3600",
+    **validators,
+  }
+  if _is_not_modified(request, validators):
+    return _not_modified(validators, headers)
 
   range_header = request.headers.get("range")
-  if range_header:
-    # Parse "bytes=start-end"
+  if range_header and total:
+    start, end = _parse_range(range_header, total)
     try:
-      byte_range = range_header.replace("bytes=", "").strip()
-      start_str, end_str = byte_range.split("-")
-      start = int(start_str)
-      end = int(end_str) if end_str else total - 1
-    except Exception:
-      raise HTTPException(status_code=400, detail="Invalid Range header")
-
-    end = min(end, total - 1)
-    chunk = raw[start : end + 1]
-    return Response(
-      content=chunk,
+      resp = open_media(file_id, start, end)
+    except DriveMediaError as e:
+      raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
+    headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+      iter_media(resp),
       status_code=206,
       media_type=mime,
-      headers={
-        "Content-Range": f"bytes {start}-{end}/{total}",
-        "Accept-Ranges": "bytes",
-        "Content-Length": str(len(chunk)),
-        "Cache-Control": "public, max-age=3600",
-      },
+      headers=headers,
     )
 
-  return Response(
-    content=raw,
+  try:
+    resp = open_media(file_id)
+  except DriveMediaError as e:
+    raise HTTPException(status_code=502, detail=f"Drive download error: {e}")
+  if total:
+    headers["Content-Length"] = str(total)
+  return StreamingResponse(
+    iter_media(resp),
     status_code=200,
     media_type=mime,
-    headers={
-      "Accept-Ranges": "bytes",
-      "Content-Length": str(total),
-      "Cache-Control": "public, max-age=3600",
-    },
+    headers=headers,
   )
@@ -1,10 +1,24 @@
+import threading
+import time
+from collections import OrderedDict
 from io import BytesIO
+from typing import Iterator, Optional
+import requests
 from googleapiclient.http import MediaIoBaseDownload
-from google_drive_client import get_credentials, get_drive
+from core.config import settings
+from google_drive_client import get_authorized_session, get_credentials, get_drive
+from .quota import is_rate_limited_response, quota
 
 class ReauthRequired(Exception):
     """Raised when Google Drive credentials are missing or expired."""
 
+class DriveMediaError(Exception):
+    """Raised when a direct media request to Drive returns an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
 def get_drive_service():
     """Return an authenticated Google Drive service client."""
     creds = get_credentials()
@@ -12,13 +26,152 @@ def get_drive_service():
         raise ReauthRequired("Google Drive credentials required")
     return get_drive(creds)
 
-def download_file_bytes(svc, file_id: str) -> bytes:
-    """Download a file’s raw bytes from Google Drive."""
+class OriginalsCache:
+    """
+    Byte-budgeted in-process LRU of downloaded originals, keyed by
+    (file_id, modifiedTime) so a Drive edit never serves stale bytes.
+    Entries also expire after a TTL to bound how long memory is held.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # Single files above this share are never cached (one video would
+        # otherwise flush everything)
+        self.max_item_bytes = max_bytes // 4
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple[str, str], tuple[float, bytes]]" = OrderedDict()
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted_bytes = 0
+        self.expired_bytes = 0
+
+    def _drop(self, key: tuple[str, str]) -> int:
+        _, data = self._entries.pop(key)
+        self._total -= len(data)
+        return len(data)
+
+    def get(self, file_id: str, version: str) -> Optional[bytes]:
+        key = (file_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, data = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                self.expired_bytes += self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, file_id: str, version: str, data: bytes) -> None:
+        if not self.max_bytes or len(data) > self.max_item_bytes:
+            return
+        key = (file_id, version)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic(), data)
+            self._total += len(data)
+            while self._total > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self.evicted_bytes += self._drop(oldest)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted_bytes": self.evicted_bytes,
+                "expired_bytes": self.expired_bytes,
+            }
+
+
+originals_cache = OriginalsCache(
+    settings.originals_cache_mb * 1024 * 1024,
+    settings.originals_cache_ttl_seconds,
+)
+
+def download_file_bytes(svc, file_id: str, version: Optional[str] = None) -> bytes:
+    """
+    Download a file’s raw bytes from Google Drive.
+    Pass the file's modifiedTime as `version` to go through originals_cache.
+    """
+    if version:
+        cached = originals_cache.get(file_id, version)
+        if cached is not None:
+            return cached
+    quota.acquire("media")
     fh = BytesIO()
     req = svc.files().get_media(fileId=file_id)
     dl = MediaIoBaseDownload(fh, req)
     done = False
     while not done:
         _, done = dl.next_chunk()
-    fh.seek(0)
-    return fh.getvalue()
+    raw = fh.getvalue()
+    if version:
+        originals_cache.put(file_id, version, raw)
+    return raw
+
+_MEDIA_META_FIELDS = "id,name,mimeType,size,modifiedTime,md5Checksum,thumbnailLink"
+
+def get_file_metadata(svc, file_id: str) -> dict:
+    """Fetch the small metadata record used to key and label media responses."""
+    quota.acquire("metadata")
+    return (
+        svc.files()
+        .get(fileId=file_id, fields=_MEDIA_META_FIELDS, supportsAllDrives=True)
+        .execute()
+    )
+
+_MEDIA_URL = "https://www.googleapis.com/drive/v3/files/{file_id}?alt=media&supportsAllDrives=true"
+
+def open_media(file_id: str, start: Optional[int] = None, end: Optional[int] = None):
+    """
+    Open a streaming HTTP response for a file's bytes, optionally for the
+    inclusive byte range start..end (end=None means "to the end of file").
+    The caller owns the response and must close it (iter_media does).
+    """
+    creds = get_credentials()
+    if not creds:
+        raise ReauthRequired("Google Drive credentials required")
+    quota.acquire("media")
+    headers = {}
+    if start is not None:
+        headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+    try:
+        resp = get_authorized_session(creds).get(
+            _MEDIA_URL.format(file_id=file_id), headers=headers, stream=True,
+            timeout=(settings.drive_stream_connect_timeout_seconds, settings.drive_stream_read_timeout_seconds),
+        )
+    except requests.RequestException as e:
+        raise DriveMediaError(504, str(e)[:200])
+    if resp.status_code not in (200, 206):
+        try:
+            body = resp.text
+        finally:
+            resp.close()
+        if is_rate_limited_response(resp.status_code, body):
+            quota.throttled("media")
+        raise DriveMediaError(resp.status_code, body[:200])
+    return resp
+
+def iter_media(resp, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield a media response's body in fixed-size chunks, closing it when done.
+    The chunk size bounds memory per open connection (DRIVE_STREAM_CHUNK_KB).
+    """
+    chunk_size = chunk_size or settings.drive_stream_chunk_kb * 1024
+    try:
+        for chunk in resp.iter_content(chunk_size=chunk_size):
+            if chunk:
+                yield chunk
+    finally:
+        resp.close()
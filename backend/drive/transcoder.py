@@ -0,0 +1,132 @@
+"""
+Process-pool transcoding service for image derivatives.
+
+Decoding and resizing (HEIC especially) is CPU-bound and holds the GIL, so
+running it on FastAPI's threadpool serialises a burst of grid requests onto
+one core.  Jobs here run the renderers from drive/image_utils.py in worker
+processes instead.
+
+Capacity is bounded: at most `workers + queue_size` jobs may be admitted at a
+time.  When that is exhausted, interactive callers get TranscoderBusy straight
+away (the route turns it into 503 + Retry-After) rather than piling up behind
+the pool; background callers may choose to wait for a slot.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TranscoderBusy(Exception):
+    """Raised when the transcode queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("transcoder saturated")
+        self.retry_after = retry_after
+
+
+class TranscodeTimeout(Exception):
+    """Raised when a job did not finish within the per-job timeout."""
+
+
+class Transcoder:
+    def __init__(self, workers: int, queue_size: int, timeout: float, retry_after: int):
+        self.workers = max(workers, 1)
+        self.capacity = self.workers + max(queue_size, 0)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: forking a threaded server process is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _release(self, _future=None) -> None:
+        with self._stats_lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def run(self, fn: Callable, *args, wait: bool = False):
+        """
+        Run fn(*args) in a worker process and return its result.
+
+        wait=False (interactive): raise TranscoderBusy if no slot is free.
+        wait=True (background): block until a slot frees up.
+        """
+        if not self._slots.acquire(blocking=wait):
+            with self._stats_lock:
+                self._rejected += 1
+            raise TranscoderBusy(self.retry_after)
+
+        with self._stats_lock:
+            self._in_flight += 1
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # The slot is released when the job really ends — a timed-out job
+        # still occupies a worker, so it must keep counting against capacity.
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise TranscodeTimeout(f"transcode exceeded {self.timeout}s")
+        except BrokenProcessPool:
+            logger.error("[transcoder] worker pool broke — restarting")
+            self._reset_pool()
+            raise
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+            }
+
+    def shutdown(self) -> None:
+        self._reset_pool()
+
+
+transcoder = Transcoder(
+    workers=settings.transcode_workers or os.cpu_count() or 1,
+    queue_size=settings.transcode_queue_size,
+    timeout=settings.transcode_timeout_seconds,
+    retry_after=settings.transcode_retry_after_seconds,
+)
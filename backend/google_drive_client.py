@@ -3,6 +3,9 @@ Google Drive client for Our Frame
 - Stores credentials in token.json (JSON)
 - Auto-refreshes access tokens
 - If refresh fails with invalid_grant (Testing mode ~7 days), raises ReauthRequired
+- Drive clients are cached per thread and per credential set (see get_drive),
+  built from the bundled discovery document over keep-alive connections;
+  direct media requests share a pooled AuthorizedSession
 
 Notes for images:
 - We query with `mimeType contains 'image/'`, which covers JPG and HEIC (image/heic).
@@ -14,16 +17,24 @@ Required:
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-from google.auth.transport.requests import Request
+import httplib2
+from google.auth.transport.requests import AuthorizedSession, Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
 from google.auth.exceptions import RefreshError
+from requests.adapters import HTTPAdapter
+
+from core.config import settings
 
 BASE_DIR = Path(__file__).resolve().parent
 CLIENT_SECRETS_FILE = BASE_DIR / "client_secrets.json"
@@ -76,6 +87,7 @@ def get_credentials(force_reauth: bool = False) -> Credentials:
         try:
             creds.refresh(Request())
             _save_credentials(creds)
+            invalidate_clients()
         except RefreshError as e:
             try:
                 TOKEN_PATH.unlink()
@@ -129,10 +141,95 @@ def exchange_code_for_credentials(code: str, redirect_uri: Optional[str] = None)
     return creds
 
 
+# ── client cache ──────────────────────────────────────────────────────────────
+
+# Credential sets remembered per thread / for media sessions (the legacy user
+# plus a few workspace connections); the least recently used is dropped.
+_MAX_CACHED_CREDENTIALS = 8
+
+_local = threading.local()
+_sessions: "OrderedDict[str, AuthorizedSession]" = OrderedDict()
+_sessions_lock = threading.Lock()
+_generation = 0
+
+
+def _credentials_key(creds: Credentials) -> str:
+    """
+    Fingerprint of a credential set.  The access token is part of it, so a
+    refreshed token yields a new key and never reuses a stale client.
+    """
+    material = "|".join(
+        str(getattr(creds, attr, "") or "")
+        for attr in ("client_id", "refresh_token", "token")
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def invalidate_clients() -> None:
+    """Drop every cached Drive client and media session (e.g. after a token refresh)."""
+    global _generation
+    with _sessions_lock:
+        _generation += 1
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _remember(cache: OrderedDict, key: str, value) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _MAX_CACHED_CREDENTIALS:
+        cache.popitem(last=False)
+
+
 def get_drive(creds: Optional[Credentials] = None):
+    """
+    Drive v3 client for `creds`, reused across calls on this thread.
+
+    googleapiclient clients (and their httplib2 transports) are not
+    thread-safe, so each thread keeps its own; within a thread the client is
+    built once per credential set, from the discovery document bundled with
+    the library (no network fetch), and keeps its connection alive.
+    """
+    if creds is None:
+        creds = get_credentials()
+    clients = getattr(_local, "clients", None)
+    if clients is None or getattr(_local, "generation", None) != _generation:
+        clients = _local.clients = OrderedDict()
+        _local.generation = _generation
+    key = _credentials_key(creds)
+    service = clients.get(key)
+    if service is None:
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=settings.drive_http_timeout_seconds))
+        service = build("drive", "v3", http=http, static_discovery=True, cache_discovery=False)
+        _remember(clients, key, service)
+    else:
+        clients.move_to_end(key)
+    return service
+
+
+def get_authorized_session(creds: Optional[Credentials] = None) -> AuthorizedSession:
+    """
+    Process-wide AuthorizedSession for direct HTTP requests to Drive (media
+    streams, thumbnailLink fetches), with a keep-alive connection pool of
+    DRIVE_HTTP_POOL_SIZE connections per host.  Safe to share between threads.
+    """
     if creds is None:
         creds = get_credentials()
-    return build("drive", "v3", credentials=creds)
+    key = _credentials_key(creds)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = AuthorizedSession(creds)
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=settings.drive_http_pool_size,
+            )
+            session.mount("https://", adapter)
+            _remember(_sessions, key, session)
+        else:
+            _sessions.move_to_end(key)
+        return session
 
 
 def list_photos(folder_id: Optional[str] = None, page_token: Optional[str] = None) -> Dict[str, Any]:
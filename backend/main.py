@@ -53,6 +53,63 @@ def _run_schema_migrations():
             conn.commit()
             logger.info("Migration: added workspaces.drive_connect_deferred")
 
+        # albums: listed_modified_time (sync watermark)
+        album_cols = {c["name"] for c in inspector.get_columns("albums")}
+        if "listed_modified_time" not in album_cols:
+            conn.execute(sa.text("ALTER TABLE albums ADD COLUMN listed_modified_time DATETIME"))
+            conn.commit()
+            logger.info("Migration: added albums.listed_modified_time")
+
+        # photos/albums: deleted_at (sync tombstones).  Runs before the
+        # photos migrations below, whose indexes include deleted_at.
+        photo_cols = {c["name"] for c in inspector.get_columns("photos")}
+        for table, cols in (("photos", photo_cols), ("albums", album_cols)):
+            if "deleted_at" not in cols:
+                conn.execute(sa.text(f"ALTER TABLE {table} ADD COLUMN deleted_at DATETIME"))
+                conn.execute(sa.text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_deleted_at ON {table} (deleted_at)"
+                ))
+                conn.commit()
+                logger.info("Migration: added %s.deleted_at", table)
+
+        # photos: created_month/created_day (throwback index), backfilled
+        if "created_month" not in photo_cols:
+            conn.execute(sa.text("ALTER TABLE photos ADD COLUMN created_month INTEGER"))
+            conn.execute(sa.text("ALTER TABLE photos ADD COLUMN created_day INTEGER"))
+            conn.execute(sa.text(
+                "UPDATE photos SET "
+                "created_month = CAST(strftime('%m', created_time) AS INTEGER), "
+                "created_day = CAST(strftime('%d', created_time) AS INTEGER) "
+                "WHERE created_time IS NOT NULL"
+            ))
+            conn.execute(sa.text(
+                "CREATE INDEX IF NOT EXISTS ix_photos_created_month_day "
+                "ON photos (created_month, created_day)"
+            ))
+            conn.commit()
+            logger.info("Migration: added + backfilled photos.created_month/created_day")
+
+        # photos: hero_score (feed/slideshow ranking), backfilled
+        if "hero_score" not in photo_cols:
+            from repositories.photo_repo import hero_score
+            conn.execute(sa.text("ALTER TABLE photos ADD COLUMN hero_score FLOAT"))
+            rows = conn.execute(sa.text("SELECT id, mime_type, width, height FROM photos")).all()
+            scores = [
+                {"id": row.id, "score": hero_score(row.mime_type, row.width, row.height)}
+                for row in rows
+            ]
+            if scores:
+                conn.execute(sa.text("UPDATE photos SET hero_score = :score WHERE id = :id"), scores)
+            conn.execute(sa.text(
+                "CREATE INDEX IF NOT EXISTS ix_photos_live_hero_score "
+                "ON photos (deleted_at, hero_score)"
+            ))
+            conn.execute(sa.text(
+                "CREATE INDEX IF NOT EXISTS ix_photos_folder_hero_score "
+                "ON photos (parent_folder_id, hero_score)"
+            ))
+            conn.commit()
+            logger.info("Migration: added + backfilled photos.hero_score")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -60,22 +117,26 @@ async def lifespan(app: FastAPI):
     create_db_and_tables()
     try:
         _run_schema_migrations()
-    except Exception as exc:
-        logger.warning("Schema migration warning (non-fatal): %s", exc)
-
-    # Run a startup sync if data is stale (non-blocking best-effort)
+    except Exception:
+        # Serving on a half-migrated schema breaks every query that touches
+        # the missing columns, so refuse to start instead
+        logger.exception("Schema migration failed")
+        raise
+
+    # Run a startup sync if data is stale — as a background job, so the app
+    # starts serving (from the existing DB) straight away
     # Legacy single-user sync — kept running during migration
     try:
-        from services.sync_service import maybe_sync_on_startup
-        from core.database import engine
-        from sqlmodel import Session as _Session
-        with _Session(engine) as session:
-            maybe_sync_on_startup(session)
+        from services.sync_jobs import sync_jobs
+        sync_jobs.submit("startup")
     except Exception as exc:
         logger.warning("Startup sync skipped: %s", exc)
 
     yield
 
+    from drive.transcoder import transcoder
+    transcoder.shutdown()
+
 
 app = FastAPI(title="Our Frame API", version="2.0", lifespan=lifespan)
 
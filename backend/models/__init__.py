@@ -4,11 +4,14 @@ from .photo import DrivePhoto
 from .favorite import Favorite
 from .ai_result import AIResult
 from .section_mapping import SectionMapping
+from .sync_state import SyncState
 from .user import User
 from .workspace import Workspace, WorkspaceMember
 from .drive_connection import DriveConnection
 from .audit_log import AuditLog
 from .session import UserSession
+from .library_stats import LibraryStats, LibraryYearCount
+from .album_section import AlbumSection, AlbumSectionsState
 
 __all__ = [
     "DriveAlbum",
@@ -16,10 +19,15 @@ __all__ = [
     "Favorite",
     "AIResult",
     "SectionMapping",
+    "SyncState",
     "User",
     "Workspace",
     "WorkspaceMember",
     "DriveConnection",
     "AuditLog",
     "UserSession",
+    "LibraryStats",
+    "LibraryYearCount",
+    "AlbumSection",
+    "AlbumSectionsState",
 ]
@@ -13,8 +13,13 @@ class DriveAlbum(SQLModel, table=True):
     photo_count: Optional[int] = None
     child_count: Optional[int] = None           # Number of sub-folders
     drive_modified_time: Optional[datetime] = None  # modifiedTime from Drive
+    # modifiedTime at the last full-sync listing of this folder's subtree;
+    # unchanged → the subtree is skipped by the next full sync
+    listed_modified_time: Optional[datetime] = None
     last_synced: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set when the folder disappears from Drive; purged after the retention period
+    deleted_at: Optional[datetime] = Field(default=None, index=True)
 
     # Enrichment fields
     excluded: bool = Field(default=False, index=True)    # Hidden from all views
@@ -0,0 +1,38 @@
+"""
+AlbumSection: the /sections classification, materialized.
+
+One row per album card per section bucket, in display order, with the card
+fields (name, resolved cover, counts) copied in so /sections is a single
+read.  Derived entirely from albums + section_mappings: rebuilt by
+sections_service.rebuild_sections after a sync, a mapping change or an
+exclusion change, and safe to drop at any time.
+
+bucket values: the section keys ("child", "travel", "milestones", "life")
+plus the video buckets ("arjun_videos", "family_travel_videos").
+An album may appear in more than one bucket.
+
+AlbumSectionsState is a single row (id=1) recording that the table has been
+built, so an empty classification is not mistaken for a missing one.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+
+class AlbumSection(SQLModel, table=True):
+    __tablename__ = "album_sections"
+
+    bucket: str = Field(primary_key=True)
+    position: int = Field(primary_key=True)
+    album_id: str = Field(index=True)
+    name: str
+    cover_photo_id: Optional[str] = None        # album cover, or resolved from sub-albums
+    photo_count: Optional[int] = None
+    child_count: Optional[int] = None
+
+
+class AlbumSectionsState(SQLModel, table=True):
+    __tablename__ = "album_sections_state"
+
+    id: int = Field(default=1, primary_key=True)
+    built_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,31 @@
+"""
+Materialized library statistics.
+
+LibraryStats is a single row (id=1) of totals read by the home feed;
+LibraryYearCount is the photos-per-year histogram behind the timeline.
+Both are rebuilt from the photo/album tables at the end of every sync and
+nudged in place by favorites add/remove — never computed on read.
+Per-album counts live on DriveAlbum.photo_count, kept by sync.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+
+class LibraryStats(SQLModel, table=True):
+    __tablename__ = "library_stats"
+
+    id: int = Field(default=1, primary_key=True)
+    total_photos: int = 0
+    total_albums: int = 0
+    total_favorites: int = 0
+    oldest_year: Optional[int] = None
+    newest_year: Optional[int] = None
+    refreshed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class LibraryYearCount(SQLModel, table=True):
+    __tablename__ = "library_year_counts"
+
+    year: int = Field(primary_key=True)
+    photo_count: int = 0
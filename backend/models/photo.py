@@ -1,19 +1,35 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
 class DrivePhoto(SQLModel, table=True):
     __tablename__ = "photos"
+    __table_args__ = (
+        # "On this day" throwback lookups
+        Index("ix_photos_created_month_day", "created_month", "created_day"),
+        # Top hero candidates: per album (home feed), library-wide (slideshow)
+        Index("ix_photos_folder_hero_score", "parent_folder_id", "hero_score"),
+        Index("ix_photos_live_hero_score", "deleted_at", "hero_score"),
+    )
 
     id: str = Field(primary_key=True)           # Google Drive file ID
     name: str
     mime_type: str
     parent_folder_id: Optional[str] = Field(default=None, index=True)
     created_time: Optional[datetime] = Field(default=None, index=True)
+    # Derived from created_time by photo_repo on every write
+    created_month: Optional[int] = None
+    created_day: Optional[int] = None
+    # Hero/slideshow ranking, derived from mime_type/width/height by
+    # photo_repo on every write; NULL = not hero-worthy (video, too narrow)
+    hero_score: Optional[float] = None
     modified_time: Optional[datetime] = None
     size: Optional[int] = None
     width: Optional[int] = None
     height: Optional[int] = None
     web_view_link: Optional[str] = None
     cached_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set when the file disappears from Drive; purged after the retention period
+    deleted_at: Optional[datetime] = Field(default=None, index=True)
@@ -0,0 +1,20 @@
+"""
+SyncState: per-root bookkeeping for incremental Drive sync.
+
+changes_page_token is the Drive Changes API cursor.  It is captured just
+before a full rescan starts and advanced after each incremental run, so
+every change after the last successful sync is seen exactly once.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+
+class SyncState(SQLModel, table=True):
+    __tablename__ = "sync_state"
+
+    root_folder_id: str = Field(primary_key=True)    # Google Drive folder ID
+    changes_page_token: Optional[str] = None
+    last_full_sync: Optional[datetime] = None
+    last_incremental_sync: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
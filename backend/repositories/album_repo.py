@@ -1,5 +1,6 @@
-from datetime import datetime
-from sqlmodel import Session, select
+from datetime import datetime, timedelta
+from sqlmodel import Session, select, delete, func, update
+from core.database import dialect_insert
 from models.album import DriveAlbum
 
 
@@ -8,6 +9,7 @@ def upsert(session: Session, album: DriveAlbum) -> DriveAlbum:
     if existing:
         existing.name = album.name
         existing.parent_id = album.parent_id
+        existing.deleted_at = None
         if album.cover_photo_id:
             existing.cover_photo_id = album.cover_photo_id
         if album.photo_count is not None:
@@ -27,8 +29,49 @@ def upsert(session: Session, album: DriveAlbum) -> DriveAlbum:
     return album
 
 
-def get_by_id(session: Session, album_id: str) -> DriveAlbum | None:
-    return session.get(DriveAlbum, album_id)
+def bulk_upsert(session: Session, rows: list[dict], chunk_size: int = 500) -> int:
+    """
+    Insert-or-update folder rows ({id, name, parent_id, drive_modified_time})
+    with INSERT ... ON CONFLICT DO UPDATE, in chunks.  Only Drive-owned
+    columns are updated; app-controlled ones (excluded, section, cover, counts)
+    are preserved.  A tombstoned folder that reappears is revived.
+    Does not commit: sync commits once per folder.
+    """
+    if not rows:
+        return 0
+    insert = dialect_insert(session)
+    now = datetime.utcnow()
+    for start in range(0, len(rows), chunk_size):
+        chunk = [
+            {"excluded": False, "created_at": now, **row, "last_synced": now, "deleted_at": None}
+            for row in rows[start:start + chunk_size]
+        ]
+        stmt = insert(DriveAlbum).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DriveAlbum.id],
+            set_={
+                "name": stmt.excluded.name,
+                "parent_id": stmt.excluded.parent_id,
+                "drive_modified_time": func.coalesce(
+                    stmt.excluded.drive_modified_time, DriveAlbum.drive_modified_time
+                ),
+                "last_synced": stmt.excluded.last_synced,
+                "deleted_at": None,
+            },
+        )
+        session.exec(stmt)
+    return len(rows)
+
+
+def _live():
+    return DriveAlbum.deleted_at.is_(None)
+
+
+def get_by_id(session: Session, album_id: str, include_deleted: bool = False) -> DriveAlbum | None:
+    album = session.get(DriveAlbum, album_id)
+    if album and album.deleted_at and not include_deleted:
+        return None
+    return album
 
 
 def get_by_parent(
@@ -38,7 +81,7 @@ def get_by_parent(
 ) -> list[DriveAlbum]:
     stmt = (
         select(DriveAlbum)
-        .where(DriveAlbum.parent_id == parent_id)
+        .where(DriveAlbum.parent_id == parent_id, _live())
         .order_by(DriveAlbum.name)
     )
     if not include_excluded:
@@ -52,7 +95,7 @@ def get_root_albums(
 ) -> list[DriveAlbum]:
     stmt = (
         select(DriveAlbum)
-        .where(DriveAlbum.parent_id.is_(None))
+        .where(DriveAlbum.parent_id.is_(None), _live())
         .order_by(DriveAlbum.name)
     )
     if not include_excluded:
@@ -71,5 +114,69 @@ def set_excluded(session: Session, album_id: str, excluded: bool) -> DriveAlbum
     return album
 
 
+def get_all_ids(session: Session) -> set[str]:
+    return set(session.exec(select(DriveAlbum.id).where(_live())).all())
+
+
+def get_excluded_ids(session: Session) -> set[str]:
+    stmt = select(DriveAlbum.id).where(DriveAlbum.excluded == True)  # noqa: E712
+    return set(session.exec(stmt).all())
+
+
+def get_watermarks(session: Session) -> dict[str, datetime]:
+    """{album_id: listed_modified_time} for folders with a sync watermark."""
+    stmt = select(DriveAlbum.id, DriveAlbum.listed_modified_time).where(
+        DriveAlbum.listed_modified_time.is_not(None)
+    )
+    return {album_id: ts for album_id, ts in session.exec(stmt).all()}
+
+
+def clear_watermarks(session: Session, album_ids: list[str]) -> None:
+    if not album_ids:
+        return
+    session.exec(
+        update(DriveAlbum)
+        .where(DriveAlbum.id.in_(album_ids))
+        .values(listed_modified_time=None)
+    )
+    session.commit()
+
+
+def set_watermarks(session: Session, watermarks: dict[str, datetime]) -> None:
+    """Store {album_id: listed_modified_time} in one bulk UPDATE.  Commits."""
+    if not watermarks:
+        return
+    session.execute(
+        update(DriveAlbum),
+        [{"id": album_id, "listed_modified_time": ts} for album_id, ts in watermarks.items()],
+    )
+    session.commit()
+
+
+def tombstone_by_ids(session: Session, album_ids: list[str], chunk_size: int = 500) -> int:
+    """
+    Soft-delete folders (sets deleted_at) and drop their sync watermark so a
+    revived folder is listed again.  Does not commit.
+    """
+    now = datetime.utcnow()
+    count = 0
+    for start in range(0, len(album_ids), chunk_size):
+        result = session.exec(
+            update(DriveAlbum)
+            .where(DriveAlbum.id.in_(album_ids[start:start + chunk_size]), _live())
+            .values(deleted_at=now, listed_modified_time=None)
+        )
+        count += result.rowcount
+    return count
+
+
+def purge_tombstones(session: Session, older_than: timedelta) -> int:
+    """Hard-delete folders tombstoned longer ago than `older_than`."""
+    cutoff = datetime.utcnow() - older_than
+    result = session.exec(delete(DriveAlbum).where(DriveAlbum.deleted_at < cutoff))
+    session.commit()
+    return result.rowcount
+
+
 def count_all(session: Session) -> int:
-    return len(session.exec(select(DriveAlbum)).all())
+    return session.exec(select(func.count()).select_from(DriveAlbum).where(_live())).one()
@@ -0,0 +1,132 @@
+from datetime import datetime
+from sqlalchemy import extract
+from sqlmodel import Session, select, delete, func, update
+from models.album import DriveAlbum
+from models.favorite import Favorite
+from models.library_stats import LibraryStats, LibraryYearCount
+from models.photo import DrivePhoto
+
+_STATS_ID = 1
+
+
+def get(session: Session) -> LibraryStats | None:
+    return session.get(LibraryStats, _STATS_ID)
+
+
+def get_or_refresh(session: Session) -> LibraryStats:
+    """The stats row, built on first use (fresh database, before any sync)."""
+    return get(session) or refresh(session)
+
+
+def get_year_counts(session: Session) -> list[LibraryYearCount]:
+    """Photos-per-year histogram, oldest year first."""
+    return list(
+        session.exec(select(LibraryYearCount).order_by(LibraryYearCount.year)).all()
+    )
+
+
+def refresh(session: Session) -> LibraryStats:
+    """
+    Recompute the stats row and year histogram from the live photo and album
+    rows: one grouped pass over photos plus two counts.  Commits.
+    """
+    year = extract("year", DrivePhoto.created_time)
+    histogram = session.exec(
+        select(year, func.count())
+        .where(DrivePhoto.deleted_at.is_(None), DrivePhoto.created_time.is_not(None))
+        .group_by(year)
+    ).all()
+
+    session.exec(delete(LibraryYearCount))
+    session.add_all(
+        LibraryYearCount(year=int(y), photo_count=count) for y, count in histogram
+    )
+
+    years = [int(y) for y, _ in histogram]
+    stats = get(session) or LibraryStats(id=_STATS_ID)
+    stats.total_photos = session.exec(
+        select(func.count()).select_from(DrivePhoto).where(DrivePhoto.deleted_at.is_(None))
+    ).one()
+    stats.total_albums = session.exec(
+        select(func.count()).select_from(DriveAlbum).where(DriveAlbum.deleted_at.is_(None))
+    ).one()
+    stats.total_favorites = session.exec(select(func.count()).select_from(Favorite)).one()
+    stats.oldest_year = min(years) if years else None
+    stats.newest_year = max(years) if years else None
+    stats.refreshed_at = datetime.utcnow()
+    session.add(stats)
+    session.commit()
+    session.refresh(stats)
+    return stats
+
+
+def folder_snapshot(session: Session, folder_id: str) -> dict:
+    """
+    The folder's share of the stats: live photos directly in it per created
+    year (None for undated) and its live sub-album count.  Indexed reads,
+    taken before and after a single-folder sync for apply_folder_delta.
+    """
+    year = extract("year", DrivePhoto.created_time)
+    years = session.exec(
+        select(year, func.count())
+        .where(DrivePhoto.parent_folder_id == folder_id, DrivePhoto.deleted_at.is_(None))
+        .group_by(year)
+    ).all()
+    albums = session.exec(
+        select(func.count())
+        .select_from(DriveAlbum)
+        .where(DriveAlbum.parent_id == folder_id, DriveAlbum.deleted_at.is_(None))
+    ).one()
+    return {
+        "years": {int(y) if y is not None else None: count for y, count in years},
+        "albums": albums,
+    }
+
+
+def apply_folder_delta(session: Session, before: dict, after: dict) -> None:
+    """
+    Move the stats by the difference between two folder_snapshot()s, instead
+    of recomputing the whole library.  No-op until the stats row exists (it
+    is then built on first read).  Commits.
+    """
+    stats = get(session)
+    if stats is None:
+        return
+    years = set(before["years"]) | set(after["years"])
+    deltas = {y: after["years"].get(y, 0) - before["years"].get(y, 0) for y in years}
+    deltas = {y: d for y, d in deltas.items() if d}
+    albums_delta = after["albums"] - before["albums"]
+    if not deltas and not albums_delta:
+        return
+
+    for y, delta in deltas.items():
+        if y is None:
+            continue
+        row = session.get(LibraryYearCount, y) or LibraryYearCount(year=y, photo_count=0)
+        row.photo_count += delta
+        if row.photo_count > 0:
+            session.add(row)
+        elif row in session:
+            session.delete(row)
+    session.flush()
+
+    oldest, newest = session.exec(
+        select(func.min(LibraryYearCount.year), func.max(LibraryYearCount.year))
+    ).one()
+    stats.total_photos += sum(deltas.values())
+    stats.total_albums += albums_delta
+    stats.oldest_year = oldest
+    stats.newest_year = newest
+    stats.refreshed_at = datetime.utcnow()
+    session.add(stats)
+    session.commit()
+
+
+def adjust_favorites(session: Session, delta: int) -> None:
+    """Apply a favorites add (+1) / remove (-1) to the stats row.  Commits."""
+    session.exec(
+        update(LibraryStats)
+        .where(LibraryStats.id == _STATS_ID)
+        .values(total_favorites=LibraryStats.total_favorites + delta)
+    )
+    session.commit()
@@ -1,21 +1,83 @@
-from datetime import datetime
-from sqlmodel import Session, select
+from datetime import datetime, timedelta
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select, delete, func, update
+from core.database import dialect_insert
+from models.favorite import Favorite
 from models.photo import DrivePhoto
 
+# Columns Drive owns — refreshed on every sync
+_SYNC_FIELDS = (
+    "name",
+    "mime_type",
+    "parent_folder_id",
+    "created_time",
+    "modified_time",
+    "size",
+    "width",
+    "height",
+    "web_view_link",
+    "cached_at",
+    "deleted_at",
+    "created_month",
+    "created_day",
+    "hero_score",
+)
+
+
+def _month_day(created: datetime | None) -> dict:
+    """The derived throwback-index columns for a created_time."""
+    if created is None:
+        return {"created_month": None, "created_day": None}
+    return {"created_month": created.month, "created_day": created.day}
+
+
+def hero_score(mime_type: str | None, width: int | None, height: int | None) -> float | None:
+    """
+    Hero/slideshow ranking, higher = better.  Rewards landscape orientation
+    and larger resolution.  None for photos that are never hero candidates:
+    videos, and images under 800px wide (stretched full-screen they blur).
+    """
+    if mime_type and mime_type.startswith("video/"):
+        return None
+    if width and width < 800:
+        return None
+    if width and height and height > 0:
+        aspect = width / height
+        # 16:9 landscape ≈ 1.78 scores best; square/portrait penalised
+        landscape_bonus = min(aspect / 1.5, 1.5)
+    else:
+        landscape_bonus = 0.5
+    size_bonus = min((width or 0) / 2000, 1.0)
+    return landscape_bonus + size_bonus
+
+
+def _derived(row: dict) -> dict:
+    """Columns photo_repo derives from the Drive fields on every write."""
+    return {
+        **_month_day(row.get("created_time")),
+        "hero_score": hero_score(row.get("mime_type"), row.get("width"), row.get("height")),
+    }
+
 
 def upsert(session: Session, photo: DrivePhoto) -> DrivePhoto:
+    for field, value in _derived(photo.model_dump()).items():
+        setattr(photo, field, value)
     existing = session.get(DrivePhoto, photo.id)
     if existing:
         existing.name = photo.name
         existing.mime_type = photo.mime_type
         existing.parent_folder_id = photo.parent_folder_id
         existing.created_time = photo.created_time
+        existing.created_month = photo.created_month
+        existing.created_day = photo.created_day
+        existing.hero_score = photo.hero_score
         existing.modified_time = photo.modified_time
         existing.size = photo.size
         existing.width = photo.width
         existing.height = photo.height
         existing.web_view_link = photo.web_view_link
         existing.cached_at = datetime.utcnow()
+        existing.deleted_at = None
         session.add(existing)
         session.commit()
         session.refresh(existing)
@@ -26,32 +88,199 @@ def upsert(session: Session, photo: DrivePhoto) -> DrivePhoto:
     return photo
 
 
+def bulk_upsert(session: Session, rows: list[dict], chunk_size: int = 500) -> int:
+    """
+    Insert-or-update photo rows with INSERT ... ON CONFLICT DO UPDATE, in
+    chunks.  A tombstoned row that reappears is revived.
+    Does not commit: sync commits once per folder.
+    """
+    if not rows:
+        return 0
+    insert = dialect_insert(session)
+    now = datetime.utcnow()
+    for start in range(0, len(rows), chunk_size):
+        chunk = [
+            {**row, **_derived(row), "cached_at": now, "deleted_at": None}
+            for row in rows[start:start + chunk_size]
+        ]
+        stmt = insert(DrivePhoto).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DrivePhoto.id],
+            set_={field: stmt.excluded[field] for field in _SYNC_FIELDS},
+        )
+        session.exec(stmt)
+    return len(rows)
+
+
+def _live():
+    return DrivePhoto.deleted_at.is_(None)
+
+
 def get_by_folder(session: Session, folder_id: str) -> list[DrivePhoto]:
     return list(
         session.exec(
             select(DrivePhoto)
-            .where(DrivePhoto.parent_folder_id == folder_id)
+            .where(DrivePhoto.parent_folder_id == folder_id, _live())
             .order_by(DrivePhoto.created_time.desc())
         ).all()
     )
 
 
-def get_by_id(session: Session, photo_id: str) -> DrivePhoto | None:
-    return session.get(DrivePhoto, photo_id)
+def get_newest_id_by_folder(session: Session, folder_id: str) -> str | None:
+    """Id of the most recently created photo directly in the folder."""
+    return session.exec(
+        select(DrivePhoto.id)
+        .where(DrivePhoto.parent_folder_id == folder_id, _live())
+        .order_by(DrivePhoto.created_time.desc())
+        .limit(1)
+    ).first()
+
+
+def is_live_in_folder(session: Session, photo_id: str, folder_id: str) -> bool:
+    """Whether the photo exists, is not tombstoned and sits directly in the folder."""
+    return session.exec(
+        select(DrivePhoto.id)
+        .where(DrivePhoto.id == photo_id, DrivePhoto.parent_folder_id == folder_id, _live())
+    ).first() is not None
+
+
+def get_by_id(session: Session, photo_id: str, include_deleted: bool = False) -> DrivePhoto | None:
+    photo = session.get(DrivePhoto, photo_id)
+    if photo and photo.deleted_at and not include_deleted:
+        return None
+    return photo
 
 
 def get_by_month_day(session: Session, month: int, day: int) -> list[DrivePhoto]:
-    """Return photos taken on the same calendar month+day across all years."""
-    all_photos = session.exec(
-        select(DrivePhoto).where(DrivePhoto.created_time.is_not(None))
-    ).all()
-    return [
-        p for p in all_photos
-        if p.created_time
-        and p.created_time.month == month
-        and p.created_time.day == day
-    ]
+    """Return photos taken on the same calendar month+day across all years, newest first."""
+    return list(
+        session.exec(
+            select(DrivePhoto)
+            .where(DrivePhoto.created_month == month, DrivePhoto.created_day == day, _live())
+            .order_by(DrivePhoto.created_time.desc())
+        ).all()
+    )
+
+
+def get_hero_candidates(
+    session: Session,
+    folder_ids: list[str],
+    per_folder: int = 4,
+    limit: int = 15,
+) -> list[DrivePhoto]:
+    """
+    The best `limit` hero-worthy photos directly in the given folders, taking
+    at most `per_folder` from any one folder so no album dominates.
+    """
+    if not folder_ids:
+        return []
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=DrivePhoto.parent_folder_id,
+            order_by=(DrivePhoto.hero_score.desc(), DrivePhoto.created_time.desc()),
+        )
+        .label("rank")
+    )
+    ranked = (
+        select(DrivePhoto, rank)
+        .where(
+            DrivePhoto.parent_folder_id.in_(folder_ids),
+            DrivePhoto.hero_score.is_not(None),
+            _live(),
+        )
+        .subquery()
+    )
+    photo = aliased(DrivePhoto, ranked)
+    return list(
+        session.exec(
+            select(photo)
+            .where(ranked.c.rank <= per_folder)
+            .order_by(photo.hero_score.desc(), photo.created_time.desc())
+            .limit(limit)
+        ).all()
+    )
+
+
+def get_top_hero(session: Session, limit: int = 15) -> list[DrivePhoto]:
+    """The best `limit` hero-worthy photos in the whole library."""
+    return list(
+        session.exec(
+            select(DrivePhoto)
+            .where(DrivePhoto.hero_score.is_not(None), _live())
+            .order_by(DrivePhoto.hero_score.desc(), DrivePhoto.created_time.desc())
+            .limit(limit)
+        ).all()
+    )
+
+
+def get_image_versions(session: Session) -> list[tuple[str, datetime | None]]:
+    """(id, modified_time) for every image, most recently modified first."""
+    return list(
+        session.exec(
+            select(DrivePhoto.id, DrivePhoto.modified_time)
+            .where(DrivePhoto.mime_type.startswith("image/"), _live())
+            .order_by(DrivePhoto.modified_time.desc())
+        ).all()
+    )
 
 
 def count_all(session: Session) -> int:
-    return len(session.exec(select(DrivePhoto)).all())
+    return session.exec(select(func.count()).select_from(DrivePhoto).where(_live())).one()
+
+
+def count_by_folder(session: Session, folder_id: str) -> int:
+    return session.exec(
+        select(func.count())
+        .select_from(DrivePhoto)
+        .where(DrivePhoto.parent_folder_id == folder_id, _live())
+    ).one()
+
+
+def get_live_ids_by_folder(session: Session, folder_id: str) -> set[str]:
+    return set(
+        session.exec(
+            select(DrivePhoto.id).where(DrivePhoto.parent_folder_id == folder_id, _live())
+        ).all()
+    )
+
+
+def tombstone_by_ids(session: Session, photo_ids: list[str], chunk_size: int = 500) -> int:
+    """Soft-delete photos (sets deleted_at).  Does not commit."""
+    now = datetime.utcnow()
+    count = 0
+    for start in range(0, len(photo_ids), chunk_size):
+        result = session.exec(
+            update(DrivePhoto)
+            .where(DrivePhoto.id.in_(photo_ids[start:start + chunk_size]), _live())
+            .values(deleted_at=now)
+        )
+        count += result.rowcount
+    return count
+
+
+def tombstone_by_folders(session: Session, folder_ids: list[str], chunk_size: int = 500) -> int:
+    """Soft-delete every photo in the given folders.  Does not commit."""
+    now = datetime.utcnow()
+    count = 0
+    for start in range(0, len(folder_ids), chunk_size):
+        result = session.exec(
+            update(DrivePhoto)
+            .where(DrivePhoto.parent_folder_id.in_(folder_ids[start:start + chunk_size]), _live())
+            .values(deleted_at=now)
+        )
+        count += result.rowcount
+    return count
+
+
+def purge_tombstones(session: Session, older_than: timedelta) -> int:
+    """
+    Hard-delete photos tombstoned longer ago than `older_than`, with their
+    favorites (which would otherwise point at a file Drive no longer has).
+    """
+    cutoff = datetime.utcnow() - older_than
+    purged = select(DrivePhoto.id).where(DrivePhoto.deleted_at < cutoff)
+    session.exec(delete(Favorite).where(Favorite.photo_id.in_(purged)))
+    result = session.exec(delete(DrivePhoto).where(DrivePhoto.deleted_at < cutoff))
+    session.commit()
+    return result.rowcount
@@ -0,0 +1,27 @@
+from datetime import datetime
+from sqlmodel import Session
+from models.sync_state import SyncState
+
+
+def get(session: Session, root_folder_id: str) -> SyncState | None:
+    return session.get(SyncState, root_folder_id)
+
+
+def save_token(
+    session: Session,
+    root_folder_id: str,
+    page_token: str | None,
+    full: bool,
+) -> SyncState:
+    state = session.get(SyncState, root_folder_id) or SyncState(root_folder_id=root_folder_id)
+    now = datetime.utcnow()
+    state.changes_page_token = page_token
+    if full:
+        state.last_full_sync = now
+    else:
+        state.last_incremental_sync = now
+    state.updated_at = now
+    session.add(state)
+    session.commit()
+    session.refresh(state)
+    return state
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
 from .photo import PhotoResponse
@@ -21,3 +22,16 @@ class HomeFeedResponse(BaseModel):
     hero_photos: list[PhotoResponse]
     throwbacks: list[ThrowbackGroup]
     stats: MemoryStats
+
+
+class YearCount(BaseModel):
+    year: int
+    count: int
+
+
+class TimelineResponse(BaseModel):
+    years: list[YearCount]      # oldest first
+    total_photos: int
+    oldest_year: Optional[int]
+    newest_year: Optional[int]
+    refreshed_at: datetime
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class SyncJobResponse(BaseModel):
+    id: str
+    kind: str                       # full | incremental | startup
+    root_id: str
+    force: bool
+    status: str                     # queued | running | succeeded | skipped | failed
+    stage: Optional[str]            # listing | incremental | purging | stats | sections | warming
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    folders_done: int
+    folders_pending: int            # discovered but not yet listed
+    folders_skipped: int            # unchanged since last listing
+    photos_upserted: int
+    error_count: int
+    errors: list[str]               # first few folder errors
+    error: Optional[str]            # why the job failed, if it did
+    eta_seconds: Optional[float]
+    result: Optional[dict]          # sync summary once finished
+
+
+class SyncJobListResponse(BaseModel):
+    jobs: list[SyncJobResponse]
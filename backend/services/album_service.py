@@ -14,6 +14,7 @@ from models.photo import DrivePhoto
 from repositories import album_repo, photo_repo
 from schemas.album import AlbumSummary, AlbumDetail, AlbumsListResponse
 from schemas.photo import PhotoResponse
+from services.album_tree import AlbumNode, AlbumTree, album_tree, resolve_cover
 from services.sync_service import sync_folder_shallow
 from core.exceptions import ReauthRequired, DriveError
 
@@ -41,7 +42,7 @@ def _to_photo_response(p: DrivePhoto, fav_ids: set[str]) -> PhotoResponse:
     )
 
 
-def _to_album_summary(album: DriveAlbum) -> AlbumSummary:
+def _to_album_summary(album: DriveAlbum | AlbumNode) -> AlbumSummary:
     return AlbumSummary(
         id=album.id,
         name=album.name,
@@ -52,23 +53,12 @@ def _to_album_summary(album: DriveAlbum) -> AlbumSummary:
     )
 
 
-def _resolve_cover(session: Session, album_id: str, depth: int = 0) -> str | None:
-    """Find a cover photo ID for an album, recursing into subfolders (max depth 3)."""
-    if depth > 3:
-        return None
-    photos = photo_repo.get_by_folder(session, album_id)
-    if photos:
-        return photos[0].id
-    children = album_repo.get_by_parent(session, album_id)
-    for child in children:
-        cover = _resolve_cover(session, child.id, depth + 1)
-        if cover:
-            return cover
-    return None
-
-
-def _to_album_summary_with_resolved_cover(session: Session, album: DriveAlbum) -> AlbumSummary:
-    cover_id = album.cover_photo_id or _resolve_cover(session, album.id)
+def _to_album_summary_with_resolved_cover(
+    session: Session,
+    tree: AlbumTree,
+    album: AlbumNode,
+) -> AlbumSummary:
+    cover_id = album.cover_photo_id or resolve_cover(session, tree, album.id)
     return AlbumSummary(
         id=album.id,
         name=album.name,
@@ -81,7 +71,7 @@ def _to_album_summary_with_resolved_cover(session: Session, album: DriveAlbum) -
 
 def get_root_albums(session: Session) -> AlbumsListResponse:
     """Return root-level albums from DB (excluded folders filtered out)."""
-    albums = album_repo.get_root_albums(session)
+    albums = album_tree.get().roots()
     summaries = [_to_album_summary(a) for a in albums]
     return AlbumsListResponse(albums=summaries, total=len(summaries))
 
@@ -92,31 +82,30 @@ def get_root_buckets(session: Session) -> AlbumsListResponse:
     top-level navigation. Uses recursive cover resolution so each bucket
     gets its own distinct thumbnail instead of all sharing the same one.
     """
-    albums = album_repo.get_root_albums(session)
-    summaries = [_to_album_summary_with_resolved_cover(session, a) for a in albums]
+    tree = album_tree.get()
+    summaries = [_to_album_summary_with_resolved_cover(session, tree, a) for a in tree.roots()]
     return AlbumsListResponse(albums=summaries, total=len(summaries))
 
 
 _STRUCTURAL_FOLDERS = {"photos", "videos"}
 
 
-def _is_structural(album: DriveAlbum) -> bool:
+def _is_structural(album: AlbumNode) -> bool:
     """True for Drive folders that are internal structure (Photos, Videos) — not real albums."""
     return album.name.lower() in _STRUCTURAL_FOLDERS
 
 
-def _flatten_subfolders(session: Session, parent_id: str) -> list[DriveAlbum]:
+def _flatten_subfolders(tree: AlbumTree, parent_id: str) -> list[AlbumNode]:
     """
     Return the real sub-albums for a parent, skipping structural Photos/Videos
     folders and surfacing their children instead.
     e.g. Arjun → [Photos, Videos] → flattened to children of Photos + children of Videos
     """
-    direct = album_repo.get_by_parent(session, parent_id)
-    result: list[DriveAlbum] = []
-    for a in direct:
+    result: list[AlbumNode] = []
+    for a in tree.children(parent_id):
         if _is_structural(a):
             # Flatten: include this structural folder's children instead
-            result.extend(album_repo.get_by_parent(session, a.id))
+            result.extend(tree.children(a.id))
         else:
             result.append(a)
     return result
@@ -143,7 +132,8 @@ def get_album_detail(
 
     album = album_repo.get_by_id(session, album_id)
     photos = photo_repo.get_by_folder(session, album_id)
-    subfolders_flat = _flatten_subfolders(session, album_id)
+    tree = album_tree.get()
+    subfolders_flat = _flatten_subfolders(tree, album_id)
 
     album_summary = _to_album_summary(album) if album else AlbumSummary(
         id=album_id, name="Album", cover_photo_id=None, photo_count=None, thumbnail_url=None
@@ -152,5 +142,5 @@ def get_album_detail(
     return AlbumDetail(
         album=album_summary,
         photos=[_to_photo_response(p, fav_ids) for p in photos],
-        subfolders=[_to_album_summary_with_resolved_cover(session, a) for a in subfolders_flat],
+        subfolders=[_to_album_summary_with_resolved_cover(session, tree, a) for a in subfolders_flat],
     )
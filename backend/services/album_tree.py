@@ -0,0 +1,186 @@
+"""
+In-process index of the album hierarchy.
+
+The live rows of `albums` are loaded with one query into parent → children
+maps; ancestor, root, depth, subtree and subtree-photo-count questions are
+then dictionary lookups instead of one query per hop.
+
+The index is held until invalidate() is called.  Every album writer calls it
+after committing (sync, section mappings, exclusion), and the next reader
+reloads.  A load that races an invalidation is used once and not kept.
+The index is per process: sync jobs run in-process, so their writes are seen.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Iterator, NamedTuple, Optional
+
+from sqlmodel import Session, select
+
+from core.config import settings
+from core.database import engine
+from models.album import DriveAlbum
+from repositories import photo_repo
+
+
+class AlbumNode(NamedTuple):
+    """Read-only snapshot of an album row (field names match DriveAlbum)."""
+    id: str
+    name: str
+    parent_id: Optional[str]
+    cover_photo_id: Optional[str]
+    photo_count: Optional[int]
+    child_count: Optional[int]
+    excluded: bool
+    section: Optional[str]
+
+
+class AlbumTree:
+    def __init__(self, albums: list[AlbumNode]):
+        # Table order, like an unordered SELECT over albums
+        self.nodes: dict[str, AlbumNode] = {a.id: a for a in albums}
+        self._roots: list[AlbumNode] = []
+        self._children: dict[str, list[AlbumNode]] = {}
+        for album in sorted(albums, key=lambda a: a.name):
+            if album.parent_id is None:
+                self._roots.append(album)
+            else:
+                self._children.setdefault(album.parent_id, []).append(album)
+        self._subtree_photos: dict[str, int] = {}
+
+    def get(self, album_id: str) -> Optional[AlbumNode]:
+        return self.nodes.get(album_id)
+
+    def roots(self, include_excluded: bool = False) -> list[AlbumNode]:
+        """Top-level albums by name."""
+        return [a for a in self._roots if include_excluded or not a.excluded]
+
+    def children(self, album_id: str, include_excluded: bool = False) -> list[AlbumNode]:
+        """Direct sub-albums by name."""
+        return [
+            a for a in self._children.get(album_id, ())
+            if include_excluded or not a.excluded
+        ]
+
+    def ancestors(self, album_id: str) -> Iterator[AlbumNode]:
+        """Parent, grandparent, ... up to the root (stops at unknown or repeated ids)."""
+        seen = {album_id}
+        current = self.nodes.get(album_id)
+        while current is not None and current.parent_id is not None:
+            if current.parent_id in seen:
+                break
+            seen.add(current.parent_id)
+            current = self.nodes.get(current.parent_id)
+            if current is not None:
+                yield current
+
+    def root(self, album_id: str) -> Optional[AlbumNode]:
+        """The top-most known ancestor, or the album itself."""
+        root = self.nodes.get(album_id)
+        for parent in self.ancestors(album_id):
+            root = parent
+        return root
+
+    def depth(self, album_id: str) -> int:
+        """Levels below the top (0 for a root album)."""
+        return sum(1 for _ in self.ancestors(album_id))
+
+    def subtree_ids(self, album_id: str, include_excluded: bool = False) -> set[str]:
+        """album_id plus every album nested beneath it."""
+        result: set[str] = set()
+        stack = [album_id]
+        while stack:
+            current = stack.pop()
+            if current in result:
+                continue
+            result.add(current)
+            stack.extend(c.id for c in self.children(current, include_excluded))
+        return result
+
+    def subtree_photo_count(self, album_id: str) -> int:
+        """Photos in the album and its visible sub-albums (from photo_count)."""
+        count = self._subtree_photos.get(album_id)
+        if count is None:
+            count = sum(
+                (self.nodes[i].photo_count or 0)
+                for i in self.subtree_ids(album_id)
+                if i in self.nodes
+            )
+            self._subtree_photos[album_id] = count
+        return count
+
+
+class AlbumTreeIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._tree: Optional[AlbumTree] = None
+        self._tree_version = -1
+
+    def get(self) -> AlbumTree:
+        with self._lock:
+            version = self._version
+            if self._tree is not None and self._tree_version == version:
+                return self._tree
+        tree = self._load()
+        with self._lock:
+            # Not kept if a write landed while loading
+            if self._version == version:
+                self._tree, self._tree_version = tree, version
+        return tree
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    @staticmethod
+    def _load() -> AlbumTree:
+        with Session(engine) as session:
+            rows = session.exec(
+                select(
+                    DriveAlbum.id,
+                    DriveAlbum.name,
+                    DriveAlbum.parent_id,
+                    DriveAlbum.cover_photo_id,
+                    DriveAlbum.photo_count,
+                    DriveAlbum.child_count,
+                    DriveAlbum.excluded,
+                    DriveAlbum.section,
+                ).where(DriveAlbum.deleted_at.is_(None))
+            ).all()
+        return AlbumTree([AlbumNode(*row) for row in rows])
+
+
+album_tree = AlbumTreeIndex()
+
+
+def resolve_cover(
+    session: Session,
+    tree: AlbumTree,
+    album_id: str,
+    newest: Optional[dict[str, Optional[str]]] = None,
+    depth: int = 0,
+) -> Optional[str]:
+    """
+    Find a cover photo ID for an album: its newest photo, else the first
+    sub-album (by name) that has one, down to settings.sync_max_depth.
+    Subtrees without photos are skipped without a query; `newest` memoizes
+    each folder's newest photo across calls.
+    """
+    if depth > settings.sync_max_depth:
+        return None
+    if newest is None:
+        newest = {}
+    node = tree.get(album_id)
+    if node is not None and not tree.subtree_photo_count(album_id):
+        return None
+    if node is None or node.photo_count:
+        if album_id not in newest:
+            newest[album_id] = photo_repo.get_newest_id_by_folder(session, album_id)
+        if newest[album_id]:
+            return newest[album_id]
+    for child in tree.children(album_id):
+        cover = resolve_cover(session, tree, child.id, newest, depth + 1)
+        if cover:
+            return cover
+    return None
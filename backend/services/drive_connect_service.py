@@ -21,10 +21,10 @@ from typing import Optional
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from sqlmodel import Session, select
 
 from core.config import settings
+from google_drive_client import get_drive
 from models.drive_connection import DriveConnection
 
 logger = logging.getLogger(__name__)
@@ -187,7 +187,8 @@ def get_drive_service_for_workspace(db: Session, workspace_id: int):
             db.commit()
             raise ValueError(f"Drive token refresh failed: {exc}") from exc
 
-    return build("drive", "v3", credentials=creds)
+    # Cached per thread and credential set; a refreshed token is a new entry
+    return get_drive(creds)
 
 
 def update_root_folder(db: Session, workspace_id: int, root_folder_id: str) -> DriveConnection:
@@ -4,12 +4,17 @@ Returns typed dicts; callers turn them into DB models or schemas as needed.
 """
 from __future__ import annotations
 
-from typing import Optional
+import logging
+import random
+import time
+from typing import Iterator, Optional
 from googleapiclient.errors import HttpError
 
-from core.exceptions import ReauthRequired, DriveError
+from core.exceptions import ReauthRequired, DriveError, ChangesTokenInvalid
+from drive.quota import is_rate_limited, quota
 from google_drive_client import get_credentials, get_drive as _build_drive_client
 
+logger = logging.getLogger(__name__)
 
 _IMAGE_MIME_FILTER = (
     "mimeType = 'application/vnd.google-apps.folder' OR "
@@ -24,17 +29,85 @@ _FILE_FIELDS = (
     "),nextPageToken"
 )
 
+# Drive's maximum for files.list
+LIST_PAGE_SIZE = 1000
+
+
+_CHANGE_FIELDS = (
+    "nextPageToken,newStartPageToken,"
+    "changes(fileId,removed,"
+    "file(id,name,mimeType,parents,trashed,"
+    "createdTime,modifiedTime,size,webViewLink,imageMediaMetadata))"
+)
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+
+
+def normalize_file(f: dict) -> dict:
+    """Flatten a Drive file resource into the dict shape sync consumes."""
+    meta = f.get("imageMediaMetadata") or {}
+    return {
+        "id": f["id"],
+        "name": f.get("name", ""),
+        "mimeType": f.get("mimeType", ""),
+        "webViewLink": f.get("webViewLink"),
+        "createdTime": f.get("createdTime"),
+        "modifiedTime": f.get("modifiedTime"),
+        "size": f.get("size"),
+        "width": meta.get("width"),
+        "height": meta.get("height"),
+    }
+
+
+# Statuses worth retrying, besides rate limits (429 / rate-limit 403)
+_RETRY_STATUSES = (500, 502, 503, 504)
+_MAX_ATTEMPTS = 5
+_MAX_BACKOFF_SECONDS = 32
+
 
 def get_drive_client():
+    """This thread's cached Drive client (see google_drive_client.get_drive)."""
     creds = get_credentials()
     if not creds:
         raise ReauthRequired("No credentials available")
     return _build_drive_client(creds)
 
 
-def list_children(parent_id: str) -> dict:
+def _execute(request, op: str):
+    """
+    Execute a Drive API request of quota class `op` (see drive/quota.py),
+    retrying rate limits and transient errors with exponential backoff plus
+    full jitter so parallel workers don't retry in lockstep.
+    Re-raises the last HttpError.
     """
-    Returns { folders: [...], files: [...] } from Drive.
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        quota.acquire(op)
+        try:
+            return request.execute()
+        except HttpError as e:
+            status = e.resp.status if hasattr(e, "resp") else 0
+            rate_limited = is_rate_limited(e)
+            if rate_limited:
+                quota.throttled(op)
+            if attempt == _MAX_ATTEMPTS or not (rate_limited or status in _RETRY_STATUSES):
+                raise
+            wait = random.uniform(0, min(2 ** attempt, _MAX_BACKOFF_SECONDS))
+            logger.warning(
+                "[drive] %s on attempt %d/%d — retrying in %.1fs",
+                e.resp.status, attempt, _MAX_ATTEMPTS, wait,
+            )
+            time.sleep(wait)
+
+
+def iter_children_pages(
+    parent_id: str,
+    page_size: int = LIST_PAGE_SIZE,
+) -> Iterator[dict]:
+    """
+    Yield a folder's children one Drive page at a time, following
+    nextPageToken to the end.  Each page is
+    { page, folders: [...], files: [...] } so callers can process (and drop)
+    it before the next one is fetched.
     Raises ReauthRequired or DriveError.
     """
     try:
@@ -44,45 +117,114 @@ def list_children(parent_id: str) -> dict:
 
     q = f"'{parent_id}' in parents and trashed = false and ({_IMAGE_MIME_FILTER})"
 
-    try:
-        resp = (
-            svc.files()
-            .list(
-                q=q,
-                fields=_FILE_FIELDS,
-                pageSize=200,
-                supportsAllDrives=True,
-                includeItemsFromAllDrives=True,
-                orderBy="name_natural",
-                spaces="drive",
+    page_token: Optional[str] = None
+    page = 0
+    while True:
+        try:
+            resp = _execute(
+                svc.files().list(
+                    q=q,
+                    fields=_FILE_FIELDS,
+                    pageSize=page_size,
+                    pageToken=page_token,
+                    supportsAllDrives=True,
+                    includeItemsFromAllDrives=True,
+                    orderBy="name_natural",
+                    spaces="drive",
+                ),
+                "list",
             )
-            .execute()
-        )
+        except HttpError as e:
+            raise DriveError(f"Drive API error: {e}")
+
+        folders = []
+        photos = []
+        for f in resp.get("files", []):
+            mime = f.get("mimeType", "")
+            if mime == FOLDER_MIME:
+                folders.append(
+                    {"id": f["id"], "name": f.get("name", ""), "modifiedTime": f.get("modifiedTime")}
+                )
+            elif mime.startswith("image/") or mime.startswith("video/"):
+                photos.append(normalize_file(f))
+
+        page += 1
+        yield {"page": page, "folders": folders, "files": photos}
+
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def list_children(parent_id: str) -> dict:
+    """
+    Returns { folders: [...], files: [...] } from Drive (all pages).
+    Raises ReauthRequired or DriveError.
+    """
+    folders: list[dict] = []
+    photos: list[dict] = []
+    pages = 0
+    for page in iter_children_pages(parent_id):
+        folders.extend(page["folders"])
+        photos.extend(page["files"])
+        pages = page["page"]
+
+    return {"parent_id": parent_id, "folders": folders, "files": photos, "pages": pages}
+
+
+def get_changes_start_token() -> str:
+    """Current Changes API cursor — changes after this point will be reported."""
+    try:
+        svc = get_drive_client()
+    except Exception:
+        raise ReauthRequired("Drive credentials missing or expired")
+    try:
+        resp = _execute(svc.changes().getStartPageToken(supportsAllDrives=True), "metadata")
     except HttpError as e:
         raise DriveError(f"Drive API error: {e}")
+    return resp["startPageToken"]
+
+
+def list_changes(page_token: str) -> tuple[list[dict], str]:
+    """
+    Fetch every change since page_token.
+    Returns (changes, new_start_token).  Each change is
+    { file_id, removed, file } where file is the raw resource (or None).
+    Raises ChangesTokenInvalid if Drive no longer accepts the token.
+    """
+    try:
+        svc = get_drive_client()
+    except Exception:
+        raise ReauthRequired("Drive credentials missing or expired")
+
+    changes: list[dict] = []
+    token: Optional[str] = page_token
+    while token:
+        try:
+            resp = _execute(
+                svc.changes().list(
+                    pageToken=token,
+                    fields=_CHANGE_FIELDS,
+                    pageSize=1000,
+                    includeRemoved=True,
+                    supportsAllDrives=True,
+                    includeItemsFromAllDrives=True,
+                    spaces="drive",
+                ),
+                "list",
+            )
+        except HttpError as e:
+            status = e.resp.status if hasattr(e, "resp") else 0
+            if status in (400, 404, 410):
+                raise ChangesTokenInvalid(f"Changes token rejected: {e}")
+            raise DriveError(f"Drive API error: {e}")
 
-    files = resp.get("files", [])
-    folders = []
-    photos = []
-
-    for f in files:
-        mime = f.get("mimeType", "")
-        if mime == "application/vnd.google-apps.folder":
-            folders.append({"id": f["id"], "name": f.get("name", "")})
-        elif mime.startswith("image/") or mime.startswith("video/"):
-            meta = f.get("imageMediaMetadata") or {}
-            photos.append(
-                {
-                    "id": f["id"],
-                    "name": f.get("name", ""),
-                    "mimeType": mime,
-                    "webViewLink": f.get("webViewLink"),
-                    "createdTime": f.get("createdTime"),
-                    "modifiedTime": f.get("modifiedTime"),
-                    "size": f.get("size"),
-                    "width": meta.get("width"),
-                    "height": meta.get("height"),
-                }
+        for c in resp.get("changes", []):
+            changes.append(
+                {"file_id": c.get("fileId"), "removed": c.get("removed", False), "file": c.get("file")}
             )
+        if "newStartPageToken" in resp:
+            return changes, resp["newStartPageToken"]
+        token = resp.get("nextPageToken")
 
-    return {"parent_id": parent_id, "folders": folders, "files": photos}
+    return changes, page_token
@@ -1,5 +1,5 @@
 from sqlmodel import Session
-from repositories import favorites_repo, photo_repo
+from repositories import favorites_repo, library_stats_repo, photo_repo
 from schemas.favorite import FavoriteCreate, FavoriteResponse, FavoritesListResponse
 from models.favorite import Favorite
 
@@ -21,7 +21,10 @@ def list_favorites(session: Session) -> FavoritesListResponse:
     favs = favorites_repo.get_all(session)
     responses = []
     for fav in favs:
-        photo = photo_repo.get_by_id(session, fav.photo_id)
+        photo = photo_repo.get_by_id(session, fav.photo_id, include_deleted=True)
+        if photo and photo.deleted_at:
+            # Gone from Drive — hidden until purged (or restored)
+            continue
         mime = photo.mime_type if photo and photo.mime_type else "image/jpeg"
         responses.append(_to_response(fav, mime))
     return FavoritesListResponse(
@@ -35,8 +38,12 @@ def add_favorite(session: Session, body: FavoriteCreate) -> FavoriteResponse:
     if existing:
         return _to_response(existing)
     fav = favorites_repo.add(session, body.photo_id, body.photo_name, body.folder_id)
+    library_stats_repo.adjust_favorites(session, +1)
     return _to_response(fav)
 
 
 def remove_favorite(session: Session, photo_id: str) -> bool:
-    return favorites_repo.remove(session, photo_id)
+    removed = favorites_repo.remove(session, photo_id)
+    if removed:
+        library_stats_repo.adjust_favorites(session, -1)
+    return removed
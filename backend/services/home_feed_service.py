@@ -4,7 +4,7 @@ Assembles the home feed response from DB data.
 Sync is handled by sync_service (startup + manual trigger).
 This service is read-only — it simply queries the DB.
 
-excluded albums are filtered out by the repository layer.
+excluded albums are filtered out by the album tree index.
 
 Phase 2 shape: hero_photos + throwbacks + stats only.
 Favorites are fetched separately by the frontend hook.
@@ -14,10 +14,17 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from sqlmodel import Session
 
-from repositories import album_repo, photo_repo, favorites_repo
-from schemas.home_feed import HomeFeedResponse, MemoryStats, ThrowbackGroup
+from repositories import photo_repo, favorites_repo, library_stats_repo
+from schemas.home_feed import (
+    HomeFeedResponse,
+    MemoryStats,
+    ThrowbackGroup,
+    TimelineResponse,
+    YearCount,
+)
 from schemas.photo import PhotoResponse
 from models.photo import DrivePhoto
+from services.album_tree import album_tree
 
 
 def _photo_url(photo_id: str, size: int = 600) -> str:
@@ -43,52 +50,20 @@ def _to_photo_resp(p: DrivePhoto, fav_ids: set[str]) -> PhotoResponse:
     )
 
 
-def _is_hero_worthy(p: DrivePhoto) -> bool:
-    """
-    Filter for hero-quality photos:
-    - Images only (no video in the hero slideshow)
-    - At least 800px wide (no tiny thumbnails stretched full-screen)
-    """
-    if p.mime_type and p.mime_type.startswith("video/"):
-        return False
-    if p.width and p.width < 800:
-        return False
-    return True
-
-
-def _hero_score(p: DrivePhoto) -> float:
-    """
-    Score a photo for hero candidacy. Higher = better.
-    Rewards landscape orientation and larger resolution.
-    """
-    if p.width and p.height and p.height > 0:
-        aspect = p.width / p.height
-        # 16:9 landscape ≈ 1.78 scores best; square/portrait penalised
-        landscape_bonus = min(aspect / 1.5, 1.5)
-    else:
-        landscape_bonus = 0.5
-    size_bonus = min((p.width or 0) / 2000, 1.0)
-    return landscape_bonus + size_bonus
-
-
 def get_home_feed(session: Session) -> HomeFeedResponse:
     fav_ids = favorites_repo.get_all_photo_ids(session)
-    albums = album_repo.get_root_albums(session)  # excluded already filtered
+    albums = album_tree.get().roots()  # excluded already filtered
 
     # ── Hero photos ──────────────────────────────────────────────────────────
-    # Collect candidates from albums that have a cover photo,
-    # cap at 4 per album for variety, score by landscape preference.
-    hero_candidates: list[DrivePhoto] = []
-    for album in albums:
-        if not album.cover_photo_id:
-            continue
-        photos = photo_repo.get_by_folder(session, album.id)
-        worthy = [p for p in photos if _is_hero_worthy(p)]
-        worthy.sort(key=_hero_score, reverse=True)
-        hero_candidates.extend(worthy[:4])
-
-    hero_candidates.sort(key=_hero_score, reverse=True)
-    hero_photos = [_to_photo_resp(p, fav_ids) for p in hero_candidates[:15]]
+    # Best-scored photos from albums that have a cover photo, capped at 4 per
+    # album for variety (ranked in SQL on the persisted hero_score).
+    hero_candidates = photo_repo.get_hero_candidates(
+        session,
+        [album.id for album in albums if album.cover_photo_id],
+        per_folder=4,
+        limit=15,
+    )
+    hero_photos = [_to_photo_resp(p, fav_ids) for p in hero_candidates]
 
     # ── Throwbacks: same month+day in prior years ─────────────────────────────
     now = datetime.now(tz=timezone.utc)
@@ -114,25 +89,14 @@ def get_home_feed(session: Session) -> HomeFeedResponse:
         )
 
     # ── Stats ─────────────────────────────────────────────────────────────────
-    all_photos = photo_repo.count_all(session)
-    all_albums_count = album_repo.count_all(session)
-    all_favs = len(fav_ids)
-
-    years = [
-        p.created_time.year
-        for album in albums
-        for p in photo_repo.get_by_folder(session, album.id)
-        if p.created_time
-    ]
-    oldest = min(years) if years else None
-    newest = max(years) if years else None
-
+    # Materialized by sync (see library_stats_repo)
+    library = library_stats_repo.get_or_refresh(session)
     stats = MemoryStats(
-        total_photos=all_photos,
-        total_albums=all_albums_count,
-        total_favorites=all_favs,
-        oldest_year=oldest,
-        newest_year=newest,
+        total_photos=library.total_photos,
+        total_albums=library.total_albums,
+        total_favorites=library.total_favorites,
+        oldest_year=library.oldest_year,
+        newest_year=library.newest_year,
     )
 
     return HomeFeedResponse(
@@ -140,3 +104,18 @@ def get_home_feed(session: Session) -> HomeFeedResponse:
         throwbacks=throwbacks,
         stats=stats,
     )
+
+
+def get_timeline(session: Session) -> TimelineResponse:
+    """Photos-per-year histogram for timeline scrubbing, read from the stats tables."""
+    library = library_stats_repo.get_or_refresh(session)
+    return TimelineResponse(
+        years=[
+            YearCount(year=row.year, count=row.photo_count)
+            for row in library_stats_repo.get_year_counts(session)
+        ],
+        total_photos=library.total_photos,
+        oldest_year=library.oldest_year,
+        newest_year=library.newest_year,
+        refreshed_at=library.refreshed_at,
+    )
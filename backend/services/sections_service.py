@@ -12,18 +12,25 @@ This means:
   - Unmatched folders can still be auto-categorised by keyword.
 
 Cover images are resolved recursively for deep folder structures.
+
+The classification is materialized in album_sections (see rebuild_sections)
+and only recomputed when sync, a mapping change or an exclusion change
+alters its inputs; /sections itself is a single read.
 """
 from __future__ import annotations
 
 import re
-from sqlmodel import Session, select
+import threading
+from datetime import datetime
+from sqlmodel import Session, select, delete
 
-from repositories import album_repo, photo_repo
+from repositories import photo_repo
 from schemas.album import AlbumSummary
 from schemas.photo import PhotoResponse
 from schemas.sections import SectionsResponse, VideoFilesResponse
-from models.album import DriveAlbum
+from models.album_section import AlbumSection, AlbumSectionsState
 from models.section_mapping import SectionMapping
+from services.album_tree import AlbumNode, AlbumTree, album_tree, resolve_cover
 
 
 # ── Keyword fallback rules ────────────────────────────────────────────────────
@@ -60,34 +67,25 @@ _KEYWORD_MAP: dict[str, re.Pattern] = {
 }
 
 
-def _photo_url(photo_id: str, size: int = 600) -> str:
-    return f"/drive/file/{photo_id}/thumbnail?s={size}"
+_SECTION_KEYS = ("child", "travel", "milestones", "life")
+_VIDEO_KEYS = ("arjun_videos", "family_travel_videos")
 
+_STATE_ID = 1
+_rebuild_lock = threading.Lock()
 
-def _resolve_cover(session: Session, album_id: str, depth: int = 0) -> str | None:
-    """Recursively find a cover photo ID for an album (max depth 3)."""
-    if depth > 3:
-        return None
-    photos = photo_repo.get_by_folder(session, album_id)
-    if photos:
-        return photos[0].id
-    children = album_repo.get_by_parent(session, album_id)
-    for child in children:
-        cover = _resolve_cover(session, child.id, depth + 1)
-        if cover:
-            return cover
-    return None
+
+def _photo_url(photo_id: str, size: int = 600) -> str:
+    return f"/drive/file/{photo_id}/thumbnail?s={size}"
 
 
-def _to_summary(session: Session, album: DriveAlbum) -> AlbumSummary:
-    cover_id = album.cover_photo_id or _resolve_cover(session, album.id)
+def _to_summary(row: AlbumSection) -> AlbumSummary:
     return AlbumSummary(
-        id=album.id,
-        name=album.name,
-        cover_photo_id=cover_id,
-        photo_count=album.photo_count,
-        child_count=album.child_count,
-        thumbnail_url=_photo_url(cover_id) if cover_id else None,
+        id=row.album_id,
+        name=row.name,
+        cover_photo_id=row.cover_photo_id,
+        photo_count=row.photo_count,
+        child_count=row.child_count,
+        thumbnail_url=_photo_url(row.cover_photo_id) if row.cover_photo_id else None,
     )
 
 
@@ -98,7 +96,7 @@ def _get_explicit_mappings(session: Session) -> dict[str, str]:
 
 
 def _classify_album(
-    album: DriveAlbum,
+    album: AlbumNode,
     explicit: dict[str, str],
 ) -> str | None:
     """
@@ -125,7 +123,7 @@ def _classify_album(
     return None
 
 
-def _get_root_section(session: Session, album: DriveAlbum, explicit: dict[str, str]) -> str | None:
+def _get_root_section(album: AlbumNode, explicit: dict[str, str], tree: AlbumTree) -> str | None:
     """
     Walk up to the root parent and classify by its name.
     This supports nested structures like: root → Arjun → First Year → photos
@@ -137,31 +135,15 @@ def _get_root_section(session: Session, album: DriveAlbum, explicit: dict[str, s
         return key
 
     # Walk up to find the root parent and classify by it
-    current = album
-    while current.parent_id is not None:
-        parent = album_repo.get_by_id(session, current.parent_id)
-        if parent is None:
-            break
+    for parent in tree.ancestors(album.id):
         key = _classify_album(parent, explicit)
         if key:
             return key
-        current = parent
 
     return None
 
 
-def _get_root_parent(session: Session, album: DriveAlbum) -> DriveAlbum:
-    """Walk up to the root (parent_id is None) and return it."""
-    current = album
-    while current.parent_id is not None:
-        parent = album_repo.get_by_id(session, current.parent_id)
-        if parent is None:
-            break
-        current = parent
-    return current
-
-
-def _get_video_sections(session: Session, all_albums: list[DriveAlbum]) -> dict[str, list[AlbumSummary]]:
+def _get_video_sections(all_albums: list[AlbumNode], tree: AlbumTree) -> dict[str, list[AlbumNode]]:
     """
     Find all folders named 'Videos' (case-insensitive) anywhere in the tree.
     Each one is bucketed based on the name of its root ancestor:
@@ -173,43 +155,33 @@ def _get_video_sections(session: Session, all_albums: list[DriveAlbum]) -> dict[
       our-frame/Videos/Arjun/       → arjun_videos
       our-frame/Videos/FamilyTravel/ → family_travel_videos
     """
-    result: dict[str, list[AlbumSummary]] = {
-        "arjun_videos": [],
-        "family_travel_videos": [],
-    }
+    result: dict[str, list[AlbumNode]] = {key: [] for key in _VIDEO_KEYS}
 
     for album in all_albums:
         name_lower = album.name.lower()
 
         # Case 1: this folder IS a "Videos" folder → bucket by its root ancestor
         if name_lower == "videos":
-            root = _get_root_parent(session, album)
-            root_name = root.name.lower()
+            root_name = tree.root(album.id).name.lower()
             if "arjun" in root_name:
-                result["arjun_videos"].append(_to_summary(session, album))
+                result["arjun_videos"].append(album)
             elif "travel" in root_name:
-                result["family_travel_videos"].append(_to_summary(session, album))
+                result["family_travel_videos"].append(album)
 
         # Case 2: folder named "Family Travel" (direct or nested) → family_travel_videos
         elif "family travel" in name_lower:
-            result["family_travel_videos"].append(_to_summary(session, album))
+            result["family_travel_videos"].append(album)
 
     return result
 
 
-def get_sections(session: Session) -> SectionsResponse:
-    from sqlmodel import select as sql_select
-    all_albums = list(session.exec(
-        sql_select(DriveAlbum).where(DriveAlbum.excluded == False)  # noqa: E712
-    ).all())
-    explicit = _get_explicit_mappings(session)
-
-    result: dict[str, list[AlbumSummary]] = {
-        "child": [],
-        "travel": [],
-        "milestones": [],
-        "life": [],
-    }
+def _classify_all(
+    all_albums: list[AlbumNode],
+    tree: AlbumTree,
+    explicit: dict[str, str],
+) -> dict[str, list[AlbumNode]]:
+    """Every bucket's albums, in display order."""
+    result: dict[str, list[AlbumNode]] = {key: [] for key in _SECTION_KEYS}
 
     # Root-level container folders — skip these, surface their children instead
     root_ids = {a.id for a in all_albums if a.parent_id is None}
@@ -219,28 +191,91 @@ def get_sections(session: Session) -> SectionsResponse:
         if album.id in root_ids:
             continue
 
-        key = _get_root_section(session, album, explicit)
+        key = _get_root_section(album, explicit, tree)
         if key and key in result:
-            result[key].append(_to_summary(session, album))
+            result[key].append(album)
 
     # Fallback: if no sub-albums found for a section, show root containers
-    for section_key in ("child", "travel", "milestones", "life"):
+    for section_key in _SECTION_KEYS:
         if not result[section_key]:
             for album in all_albums:
                 if album.id in root_ids:
                     key = _classify_album(album, explicit)
                     if key == section_key:
-                        result[section_key].append(_to_summary(session, album))
+                        result[section_key].append(album)
+
+    result.update(_get_video_sections(all_albums, tree))
+    return result
+
+
+def rebuild_sections(session: Session) -> int:
+    """
+    Recompute the album_sections table from albums + section mappings.
+    Called after a sync, a mapping change or an exclusion change; parent
+    walks and cover lookups run over the album tree index.
+    Returns the number of album cards written.  Commits.
+    """
+    # Rebuilds in this process run one at a time (they rewrite the same keys)
+    with _rebuild_lock:
+        tree = album_tree.get()
+        # Parent walks see excluded ancestors; sections only list visible albums
+        all_albums = [a for a in tree.nodes.values() if not a.excluded]
+        buckets = _classify_all(all_albums, tree, _get_explicit_mappings(session))
+
+        newest: dict[str, str | None] = {}
+        rows = [
+            AlbumSection(
+                bucket=bucket,
+                position=position,
+                album_id=album.id,
+                name=album.name,
+                cover_photo_id=album.cover_photo_id
+                or resolve_cover(session, tree, album.id, newest),
+                photo_count=album.photo_count,
+                child_count=album.child_count,
+            )
+            for bucket, albums in buckets.items()
+            for position, album in enumerate(albums)
+        ]
+        session.exec(delete(AlbumSection))
+        session.add_all(rows)
+        state = session.get(AlbumSectionsState, _STATE_ID) or AlbumSectionsState(id=_STATE_ID)
+        state.built_at = datetime.utcnow()
+        session.add(state)
+        session.commit()
+        return len(rows)
+
+
+def _read_buckets(session: Session) -> dict[str, list[AlbumSection]]:
+    result: dict[str, list[AlbumSection]] = {key: [] for key in _SECTION_KEYS + _VIDEO_KEYS}
+    rows = session.exec(
+        select(AlbumSection).order_by(AlbumSection.bucket, AlbumSection.position)
+    ).all()
+    for row in rows:
+        result.setdefault(row.bucket, []).append(row)
+    return result
+
+
+def _get_buckets(session: Session) -> dict[str, list[AlbumSection]]:
+    """The materialized buckets; built on first use (fresh or upgraded database)."""
+    if session.get(AlbumSectionsState, _STATE_ID) is None:
+        rebuild_sections(session)
+    return _read_buckets(session)
+
+
+def get_sections(session: Session) -> SectionsResponse:
+    buckets = _get_buckets(session)
 
-    video_sections = _get_video_sections(session, all_albums)
+    def summaries(key: str) -> list[AlbumSummary]:
+        return [_to_summary(row) for row in buckets[key]]
 
     return SectionsResponse(
-        featured_child=result["child"],
-        travel=result["travel"],
-        milestones=result["milestones"],
-        life=result["life"],
-        arjun_videos=video_sections["arjun_videos"],
-        family_travel_videos=video_sections["family_travel_videos"],
+        featured_child=summaries("child"),
+        travel=summaries("travel"),
+        milestones=summaries("milestones"),
+        life=summaries("life"),
+        arjun_videos=summaries("arjun_videos"),
+        family_travel_videos=summaries("family_travel_videos"),
     )
 
 
@@ -253,16 +288,11 @@ def get_video_files(
     Return the actual video files (not album cards) for a video section.
     Collects all video-mime files from every album in the given section.
     """
-    from sqlmodel import select as sql_select
-    all_albums = list(session.exec(
-        sql_select(DriveAlbum).where(DriveAlbum.excluded == False)  # noqa: E712
-    ).all())
-    video_sections = _get_video_sections(session, all_albums)
-    section_albums = video_sections.get(section_key, [])
+    section_albums = _get_buckets(session).get(section_key, [])
 
     videos: list[PhotoResponse] = []
-    for album_summary in section_albums:
-        files = photo_repo.get_by_folder(session, album_summary.id)
+    for row in section_albums:
+        files = photo_repo.get_by_folder(session, row.album_id)
         for p in files:
             if p.mime_type and p.mime_type.startswith("video/"):
                 videos.append(PhotoResponse(
@@ -339,10 +369,12 @@ def _stamp_album_section(
     folder_id: str,
     section_key: str | None,
 ) -> None:
-    """Keep album.section in sync when a mapping is added/removed."""
+    """Keep album.section and the materialized sections in sync when a mapping is added/removed."""
     from repositories import album_repo as ar
     album = ar.get_by_id(session, folder_id)
     if album:
         album.section = section_key
         session.add(album)
         session.commit()
+        album_tree.invalidate()
+    rebuild_sections(session)
@@ -3,7 +3,7 @@ Slideshow service.
 
 Logic:
   - If favorites exist → return all favorited photos in random order
-  - If no favorites → fallback to top 15 recent landscape photos
+  - If no favorites → fallback to the top 15 photos by hero_score
 """
 from __future__ import annotations
 
@@ -39,46 +39,25 @@ def _to_photo_resp(p: DrivePhoto, fav_ids: set[str]) -> PhotoResponse:
     )
 
 
-def _is_slideshow_worthy(p: DrivePhoto) -> bool:
-    """Images only, at least 800px wide."""
-    if p.mime_type and p.mime_type.startswith("video/"):
-        return False
-    if p.width and p.width < 800:
-        return False
-    return True
-
-
-def _score(p: DrivePhoto) -> float:
-    if p.width and p.height and p.height > 0:
-        aspect = p.width / p.height
-        landscape_bonus = min(aspect / 1.5, 1.5)
-    else:
-        landscape_bonus = 0.5
-    size_bonus = min((p.width or 0) / 2000, 1.0)
-    return landscape_bonus + size_bonus
-
-
 def get_slideshow_photos(session: Session) -> list[PhotoResponse]:
     """
     Returns photos for the hero slideshow.
-    Priority: favorited images → fallback to top scored recent images.
+    Priority: favorited images → fallback to the top-scored images.
     """
     fav_ids: set[str] = set(session.exec(select(Favorite.photo_id)).all())
 
     if fav_ids:
         # Fetch all favorited photos, shuffle for variety
-        rows = session.exec(
-            select(DrivePhoto).where(DrivePhoto.id.in_(fav_ids))
-        ).all()
-        worthy = [p for p in rows if _is_slideshow_worthy(p)]
+        worthy = list(session.exec(
+            select(DrivePhoto).where(
+                DrivePhoto.id.in_(fav_ids),
+                DrivePhoto.hero_score.is_not(None),
+                DrivePhoto.deleted_at.is_(None),
+            )
+        ).all())
         random.shuffle(worthy)
         if worthy:
             return [_to_photo_resp(p, fav_ids) for p in worthy]
 
-    # Fallback: recent wide photos across all albums
-    all_photos = session.exec(
-        select(DrivePhoto).order_by(DrivePhoto.created_time.desc())
-    ).all()
-    worthy = [p for p in all_photos if _is_slideshow_worthy(p)]
-    worthy.sort(key=_score, reverse=True)
-    return [_to_photo_resp(p, fav_ids) for p in worthy[:15]]
+    # Fallback: top-scored wide photos across all albums
+    return [_to_photo_resp(p, fav_ids) for p in photo_repo.get_top_hero(session, limit=15)]
@@ -0,0 +1,213 @@
+"""
+Sync job runner: executes Drive syncs in the background.
+
+POST /sync/drive and the startup hook enqueue a job and return at once; the
+job runs sync_root (or maybe_sync_on_startup) on its own thread with its own
+DB session and records progress as the sync reports it.
+
+Only one sync per root runs at a time — enqueueing while one is queued or
+running returns the existing job instead of starting a second.
+
+Jobs live in memory only: the most recent JOB_HISTORY are kept for status
+polling and are forgotten on restart.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlmodel import Session
+
+from core.config import settings
+from core.database import engine
+from drive import quota
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for GET /sync/jobs/{id}
+JOB_HISTORY = 50
+# Folder errors kept per job (the count is always exact)
+MAX_JOB_ERRORS = 20
+
+JOB_KINDS = ("full", "incremental", "startup")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+class SyncJob:
+    def __init__(self, kind: str, root_id: str, force: bool = False):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.root_id = root_id
+        self.force = force
+        self.status = "queued"  # queued | running | succeeded | skipped | failed
+        self.stage: Optional[str] = None
+        self.created_at = _utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.folders_done = 0
+        self.folders_pending = 0
+        self.folders_skipped = 0
+        self.photos_upserted = 0
+        self.error_count = 0
+        self.errors: list[str] = []
+        self.error: Optional[str] = None
+        self.result: Optional[dict] = None
+        self._started_mono: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def on_progress(self, event: str, **data) -> None:
+        """Progress callback handed to sync_root (see sync_service.ProgressFn)."""
+        with self._lock:
+            if event == "stage":
+                self.stage = data["stage"]
+            elif event == "folder":
+                self.folders_done += 1
+                self.photos_upserted += data.get("photos", 0)
+            elif event == "skipped":
+                self.folders_skipped += 1
+            elif event == "error":
+                self.error_count += 1
+                if len(self.errors) < MAX_JOB_ERRORS:
+                    self.errors.append(f"{data.get('folder_id')}: {data.get('message')}")
+            if "pending" in data:
+                self.folders_pending = data["pending"]
+
+    def _eta_seconds(self) -> Optional[float]:
+        """
+        Pending folders divided by the observed listing rate.  Folders not yet
+        discovered aren't counted, so this is a lower bound while the
+        traversal is still fanning out.
+        """
+        if self.status != "running" or self._started_mono is None:
+            return None
+        if not self.folders_done or not self.folders_pending:
+            return None
+        elapsed = time.monotonic() - self._started_mono
+        return round(self.folders_pending * elapsed / self.folders_done, 1)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "root_id": self.root_id,
+                "force": self.force,
+                "status": self.status,
+                "stage": self.stage,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "folders_done": self.folders_done,
+                "folders_pending": self.folders_pending,
+                "folders_skipped": self.folders_skipped,
+                "photos_upserted": self.photos_upserted,
+                "error_count": self.error_count,
+                "errors": list(self.errors),
+                "error": self.error,
+                "eta_seconds": self._eta_seconds(),
+                "result": self.result,
+            }
+
+
+class SyncJobRunner:
+    def __init__(self, history: int = JOB_HISTORY):
+        self._history = history
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, SyncJob] = OrderedDict()
+        self._active: dict[str, SyncJob] = {}
+
+    def submit(self, kind: str, force: bool = False) -> tuple[SyncJob, bool]:
+        """
+        Enqueue a sync of the configured root.
+        Returns (job, created); created is False when a sync of that root was
+        already queued or running and its job is returned instead.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"unknown sync job kind: {kind}")
+        root_id = settings.effective_root_folder
+        with self._lock:
+            current = self._active.get(root_id)
+            if current is not None:
+                return current, False
+            job = SyncJob(kind, root_id, force=force)
+            self._jobs[job.id] = job
+            self._active[root_id] = job
+            self._trim()
+
+        threading.Thread(
+            target=self._run, args=(job,), name=f"sync-{job.id[:8]}", daemon=True
+        ).start()
+        return job, True
+
+    def get(self, job_id: str) -> Optional[SyncJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[SyncJob]:
+        """Known jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def _trim(self) -> None:
+        # Caller holds the lock; active jobs are never dropped
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self._history:
+                break
+            if not self._jobs[job_id].active:
+                del self._jobs[job_id]
+
+    def _run(self, job: SyncJob) -> None:
+        from services.sync_service import maybe_sync_on_startup, sync_root
+
+        with job._lock:
+            job.status = "running"
+            job.started_at = _utcnow()
+            job._started_mono = time.monotonic()
+        logger.info("sync job %s (%s) started", job.id, job.kind)
+        try:
+            # Sync yields Drive quota to interactive requests
+            with quota.background(), Session(engine) as session:
+                if job.kind == "startup":
+                    result = maybe_sync_on_startup(session, progress=job.on_progress)
+                else:
+                    result = sync_root(
+                        session,
+                        incremental=job.kind == "incremental",
+                        force=job.force,
+                        progress=job.on_progress,
+                    )
+            with job._lock:
+                job.result = result
+                if result.get("failed"):
+                    job.status = "failed"
+                    job.error = result.get("reason")
+                else:
+                    job.status = "skipped" if result.get("skipped") else "succeeded"
+        except Exception as e:
+            logger.exception("sync job %s failed", job.id)
+            with job._lock:
+                job.status = "failed"
+                job.error = str(e)
+        finally:
+            with job._lock:
+                job.finished_at = _utcnow()
+                job.folders_pending = 0
+            with self._lock:
+                if self._active.get(job.root_id) is job:
+                    del self._active[job.root_id]
+            logger.info("sync job %s finished: %s", job.id, job.status)
+
+
+sync_jobs = SyncJobRunner()
@@ -8,9 +8,22 @@ Strategy
 - On app startup: run a lightweight sync if root was not synced in the last
   SYNC_STALE_SECONDS seconds.  This keeps data reasonably fresh without hitting
   Drive on every request.
-- Manual sync: POST /sync/drive triggers a full rescan immediately.
+- Manual sync: POST /sync/drive enqueues a full rescan.  Root syncs run as
+  background jobs (services/sync_jobs.py), startup's included.  Folders
+  whose Drive modifiedTime matches the watermark stored at their last listing
+  are skipped with their subtree (?force=true relists everything).
+- Incremental sync: a full rescan records a Drive Changes API page token
+  (SyncState); later runs with incremental=True fetch only the files and
+  folders changed since then and apply them, falling back to a full rescan
+  if Drive rejects the token.
 - Album-detail syncs: when a user opens a specific album we do a shallow sync of
   just that one folder so photos stay up to date.
+- Deletions: photos and folders that disappear from Drive are tombstoned
+  (deleted_at) — by set difference against each complete folder listing, or
+  from Changes API removals — and hidden from every read.  Tombstones older
+  than TOMBSTONE_RETENTION_DAYS are purged at the end of each root sync.
+- Optional warm-up (SYNC_WARM_DERIVATIVES): after a root sync, thumbnails and
+  previews missing from the derivative cache are pre-rendered.
 
 The sync does NOT touch excluded albums further than marking them (exclusion is
 a UI layer concern — the folder stays in DB but is filtered at query time).
@@ -18,21 +31,47 @@ a UI layer concern — the folder stays in DB but is filtered at query time).
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from typing import Callable, Iterable, Iterator, Optional
 from sqlmodel import Session
 
 from core.config import settings
-from core.exceptions import ReauthRequired, DriveError
+from core.exceptions import ReauthRequired, DriveError, ChangesTokenInvalid
+from drive import quota
 from models.album import DriveAlbum
 from models.section_mapping import SectionMapping
-from repositories import album_repo, photo_repo
-from services.drive_service import list_children, get_drive_client
+from repositories import album_repo, library_stats_repo, photo_repo, sync_state_repo
+from services import sections_service
+from services.album_tree import album_tree
+from services.drive_service import (
+    FOLDER_MIME,
+    get_changes_start_token,
+    iter_children_pages,
+    list_changes,
+    list_children,
+    normalize_file,
+)
 
 logger = logging.getLogger(__name__)
 
 # How old a root sync can be before we re-sync on startup
 SYNC_STALE_SECONDS = 3600  # 1 hour
 
+# Optional progress callback: progress(event, **data).  Events:
+#   stage   (stage=...)                      — a sync phase began
+#   folder  (photos=n, pending=n)            — a folder listing was applied
+#   skipped (pending=n)                      — an unchanged folder was skipped
+#   error   (folder_id=..., message=..., pending=n) — a folder listing failed
+ProgressFn = Optional[Callable[..., None]]
+
+
+def _report(progress: ProgressFn, event: str, **data) -> None:
+    if progress is not None:
+        progress(event, **data)
+
 
 # ── helpers ───────────────────────────────────────────────────────────────────
 
@@ -49,6 +88,40 @@ def _is_stale(last_synced: datetime | None, threshold_seconds: int = SYNC_STALE_
     return (_utcnow() - last_synced).total_seconds() > threshold_seconds
 
 
+def _parse_drive_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+
+def _photo_row(p: dict, folder_id: str) -> dict:
+    """Column values for a photos row from a normalized Drive file dict."""
+    return {
+        "id": p["id"],
+        "name": p["name"],
+        "mime_type": p["mimeType"],
+        "parent_folder_id": folder_id,
+        "created_time": _parse_drive_time(p.get("createdTime")),
+        "modified_time": _parse_drive_time(p.get("modifiedTime")),
+        "size": int(p["size"]) if p.get("size") else None,
+        "width": p.get("width"),
+        "height": p.get("height"),
+        "web_view_link": p.get("webViewLink"),
+    }
+
+
+def _album_row(f: dict, parent_id: str | None) -> dict:
+    return {
+        "id": f["id"],
+        "name": f["name"],
+        "parent_id": parent_id,
+        "drive_modified_time": _parse_drive_time(f.get("modifiedTime")),
+    }
+
+
 def _upsert_album_from_drive(
     session: Session,
     folder_id: str,
@@ -56,7 +129,7 @@ def _upsert_album_from_drive(
     parent_id: str | None,
     drive_modified_time: datetime | None = None,
 ) -> DriveAlbum:
-    existing = album_repo.get_by_id(session, folder_id)
+    existing = album_repo.get_by_id(session, folder_id, include_deleted=True)
     now = _utcnow()
 
     if existing:
@@ -67,6 +140,7 @@ def _upsert_album_from_drive(
         if drive_modified_time:
             existing.drive_modified_time = drive_modified_time
         existing.last_synced = now
+        existing.deleted_at = None
         session.add(existing)
         session.commit()
         session.refresh(existing)
@@ -102,82 +176,388 @@ def sync_folder_shallow(session: Session, folder_id: str) -> dict:
     """
     Sync ONE folder's immediate children from Drive into the DB.
     Updates sub-folder records and photo records.
+    Drive results are consumed page by page, so memory stays bounded by one
+    page even for folders with thousands of photos.  Each page is written
+    with bulk upserts and the whole folder is committed once.
+    Library stats move by this folder's delta rather than being recomputed;
+    the album tree and sections are only rebuilt when the folder's card or
+    its sub-albums actually changed (album opens are a read path).
     Returns summary dict.
     """
-    now = _utcnow()
-    data = list_children(folder_id)
+    before = library_stats_repo.folder_snapshot(session, folder_id)
+    shape = _album_shape(session, folder_id)
+    result = _apply_folder(session, folder_id, iter_children_pages(folder_id))
+    if result["albums_removed"]:
+        # A vanished sub-folder takes its whole subtree with it: recount
+        library_stats_repo.refresh(session)
+    else:
+        library_stats_repo.apply_folder_delta(
+            session, before, library_stats_repo.folder_snapshot(session, folder_id)
+        )
+    if _album_shape(session, folder_id) != shape:
+        album_tree.invalidate()
+        sections_service.rebuild_sections(session)
+    return result
+
+
+def _album_shape(session: Session, folder_id: str) -> tuple:
+    """What the album tree and sections see of a folder: its card fields and sub-albums."""
+    album = album_repo.get_by_id(session, folder_id)
+    card = (album.cover_photo_id, album.photo_count, album.child_count) if album else None
+    children = frozenset(
+        (a.id, a.name)
+        for a in album_repo.get_by_parent(session, folder_id, include_excluded=True)
+    )
+    return card, children
 
-    # Upsert sub-folders
-    for f in data["folders"]:
-        modified = None
-        if f.get("modifiedTime"):
-            try:
-                modified = datetime.fromisoformat(f["modifiedTime"].replace("Z", "+00:00"))
-            except Exception:
-                pass
-        _upsert_album_from_drive(session, f["id"], f["name"], folder_id, modified)
 
-    # Update child_count on the parent album
-    parent = album_repo.get_by_id(session, folder_id)
-    if parent:
-        parent.child_count = len(data["folders"])
-
-    # Upsert photos
-    cover_photo_id: str | None = None
-    for idx, p in enumerate(data["files"]):
-        created = None
-        if p.get("createdTime"):
-            try:
-                created = datetime.fromisoformat(p["createdTime"].replace("Z", "+00:00"))
-            except Exception:
-                pass
-        modified = None
-        if p.get("modifiedTime"):
-            try:
-                modified = datetime.fromisoformat(p["modifiedTime"].replace("Z", "+00:00"))
-            except Exception:
-                pass
-
-        from models.photo import DrivePhoto
-        photo = DrivePhoto(
-            id=p["id"],
-            name=p["name"],
-            mime_type=p["mimeType"],
-            parent_folder_id=folder_id,
-            created_time=created,
-            modified_time=modified,
-            size=int(p["size"]) if p.get("size") else None,
-            width=p.get("width"),
-            height=p.get("height"),
-            web_view_link=p.get("webViewLink"),
-        )
-        photo_repo.upsert(session, photo)
-        if idx == 0:
-            cover_photo_id = p["id"]
+def _apply_folder(
+    session: Session,
+    folder_id: str,
+    pages: Iterable[dict],
+) -> dict:
+    """
+    Write one folder's Drive listing (an iterable of pages) to the DB.
+    Once the listing is complete, photos and sub-folders the DB still has
+    under this folder but Drive no longer lists are tombstoned.
+    The summary also carries the sub-folders seen ({id, modifiedTime}), so a
+    traversal can descend without re-reading them.
+    """
+    now = _utcnow()
+    folder_count = 0
+    photo_count = 0
+    page_count = 0
+    children: list[dict] = []
+    seen_photo_ids: set[str] = set()
+
+    for page in pages:
+        page_count += 1
+
+        # Upsert sub-folders
+        album_repo.bulk_upsert(session, [_album_row(f, folder_id) for f in page["folders"]])
+        children.extend(page["folders"])
+        folder_count += len(page["folders"])
+
+        # Upsert photos
+        photo_repo.bulk_upsert(session, [_photo_row(p, folder_id) for p in page["files"]])
+        seen_photo_ids.update(p["id"] for p in page["files"])
+        photo_count += len(page["files"])
+
+    photos_removed, albums_removed = _tombstone_missing(
+        session, folder_id, {f["id"] for f in children}, seen_photo_ids
+    )
 
     # Update the album record we just synced
+    parent = album_repo.get_by_id(session, folder_id, include_deleted=True)
     if parent:
-        if cover_photo_id and not parent.cover_photo_id:
-            parent.cover_photo_id = cover_photo_id
-        parent.photo_count = len(data["files"])
+        parent.child_count = folder_count
+        _refresh_cover(session, parent)
+        parent.photo_count = photo_count
         parent.last_synced = now
         session.add(parent)
-        session.commit()
+    session.commit()
 
     return {
         "folder_id": folder_id,
-        "folders_synced": len(data["folders"]),
-        "photos_synced": len(data["files"]),
+        "folders_synced": folder_count,
+        "photos_synced": photo_count,
+        "pages": page_count,
+        "items": folder_count + photo_count,
+        "photos_removed": photos_removed,
+        "albums_removed": albums_removed,
+        "children": children,
     }
 
 
-def sync_root(session: Session) -> dict:
+def _refresh_cover(session: Session, album: DriveAlbum) -> None:
+    """
+    Keep album.cover_photo_id on a live photo of the album: a cover that was
+    removed or moved elsewhere is cleared, and an album without one takes its
+    newest live photo.  Does not commit.
+    """
+    if album.cover_photo_id and not photo_repo.is_live_in_folder(session, album.cover_photo_id, album.id):
+        album.cover_photo_id = None
+    if not album.cover_photo_id:
+        album.cover_photo_id = photo_repo.get_newest_id_by_folder(session, album.id)
+
+
+def _tombstone(session: Session, photo_ids: set[str], album_ids: set[str]) -> tuple[int, int]:
+    """
+    Soft-delete photos and folders; a folder takes its whole subtree (and the
+    photos in it) with it.  Does not commit.  Returns (photos, albums).
+    """
+    subtree = _subtree_ids(session, list(album_ids)) if album_ids else set()
+    photos = photo_repo.tombstone_by_ids(session, list(photo_ids))
+    photos += photo_repo.tombstone_by_folders(session, list(subtree))
+    albums = album_repo.tombstone_by_ids(session, list(subtree))
+    return photos, albums
+
+
+def _tombstone_missing(
+    session: Session,
+    folder_id: str | None,
+    seen_folder_ids: set[str],
+    seen_photo_ids: set[str] | None = None,
+) -> tuple[int, int]:
+    """
+    Set difference between the DB and a complete Drive listing of folder_id
+    (None = root, whose photos aren't synced): live rows under the folder that
+    the listing didn't include are tombstoned.  Returns (photos, albums).
+    """
+    if folder_id is None:
+        known = album_repo.get_root_albums(session, include_excluded=True)
+    else:
+        known = album_repo.get_by_parent(session, folder_id, include_excluded=True)
+    gone_albums = {a.id for a in known} - seen_folder_ids
+    gone_photos: set[str] = set()
+    if seen_photo_ids is not None and folder_id is not None:
+        gone_photos = photo_repo.get_live_ids_by_folder(session, folder_id) - seen_photo_ids
+    if not gone_albums and not gone_photos:
+        return 0, 0
+    logger.info(
+        "sync: folder %s — tombstoning %d photos, %d sub-folders no longer in Drive",
+        folder_id or "root", len(gone_photos), len(gone_albums),
+    )
+    return _tombstone(session, gone_photos, gone_albums)
+
+
+def _fetch_folder(folder_id: str) -> Iterator[dict]:
+    """Worker side of the traversal: list one folder on this thread's client."""
+    with quota.background():
+        yield from iter_children_pages(folder_id)
+
+
+class _FolderListing:
+    """
+    One folder's Drive listing, handed from a traversal worker to the single
+    writer a page at a time.  The hand-off queue holds one page, so a worker
+    runs at most a page ahead of the writer and a folder is never held in
+    memory whole.  The listing announces itself on `ready` once its first
+    page (or its end, or its failure) is available.
+    """
+    _DONE = object()
+
+    def __init__(self, folder_id: str, ready: "queue.Queue[_FolderListing]"):
+        self.folder_id = folder_id
+        self.error: Exception | None = None
+        self._ready = ready
+        self._pages: queue.Queue = queue.Queue(maxsize=1)
+        self._cancelled = threading.Event()
+
+    def produce(self) -> None:
+        """Worker side: run _fetch_folder and hand its pages over."""
+        announced = False
+        try:
+            for page in _fetch_folder(self.folder_id):
+                self._put(page)
+                if not announced:
+                    self._ready.put(self)
+                    announced = True
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(self._DONE)
+            if not announced:
+                self._ready.put(self)
+
+    def _put(self, item) -> None:
+        # Give up once the writer has gone away, so the pool can shut down
+        while not self._cancelled.is_set():
+            try:
+                self._pages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def __iter__(self) -> Iterator[dict]:
+        """Writer side: the pages in order; re-raises the listing's failure."""
+        while True:
+            item = self._pages.get()
+            if item is self._DONE:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield item
+
+
+def _watermark(modified: str | None) -> datetime | None:
+    """Drive modifiedTime as the naive-UTC datetime the DB hands back."""
+    dt = _parse_drive_time(modified)
+    if dt is None:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _traverse(
+    session: Session,
+    root_id: str,
+    folders: list[dict],
+    max_depth: int,
+    force: bool = False,
+    progress: ProgressFn = None,
+) -> dict:
+    """
+    Breadth-first sync of the given top-level folders ({id, modifiedTime},
+    depth 1) and their descendants, listing folders down to `max_depth`
+    levels below root.
+
+    Drive listings run on a pool of settings.sync_concurrency worker threads
+    (each with its own Drive client); this thread is the only DB writer.  It
+    applies a folder page by page as the worker hands pages over (one page
+    at a time, see _FolderListing), then queues the sub-folders it found.
+    Sub-folders marked excluded are not queued.
+
+    Every folder is listed at most once: a folder with several parents, or a
+    cycle back to an ancestor, is reached again but not re-queued.
+
+    Unless `force` is set, a folder whose modifiedTime equals its stored
+    watermark is skipped together with its subtree.  Watermarks are written
+    only after the whole traversal has finished, and only for folders whose
+    subtree was listed without a failure; a failed listing (any exception)
+    clears the watermarks of the folder and its ancestors instead.  If the
+    traversal itself aborts, the watermarks of every folder it entered are
+    cleared, so an interrupted run never leaves a subtree marked as synced.
+    Drive does not bump a folder's modifiedTime for changes deep inside it —
+    those arrive through incremental sync, or a forced run.
+
+    Returns totals plus per-depth counts of folders listed and photos synced.
+    """
+    excluded = album_repo.get_excluded_ids(session)
+    watermarks = {} if force else album_repo.get_watermarks(session)
+    visited: set[str] = {root_id}
+    parents: dict[str, str] = {}
+    # Folders listed and descended into → the modifiedTime to store
+    listed: dict[str, datetime] = {}
+    # Folders whose listing failed, and their ancestors
+    failed: set[str] = set()
+    totals: dict = {
+        "folders": 0, "photos": 0, "pages": 0, "revisits": 0, "skipped": 0,
+        "photos_removed": 0, "albums_removed": 0,
+    }
+    depth_counts: dict[int, dict[str, int]] = {}
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max(settings.sync_concurrency, 1),
+            thread_name_prefix="sync",
+        ) as pool:
+            ready: queue.Queue[_FolderListing] = queue.Queue()
+            # folder_id → (listing, depth, modifiedTime) until applied or failed
+            in_flight: dict[str, tuple[_FolderListing, int, datetime | None]] = {}
+
+            def enqueue(folder: dict, depth: int, parent_id: str | None) -> None:
+                folder_id = folder["id"]
+                if folder_id in visited:
+                    totals["revisits"] += 1
+                    return
+                visited.add(folder_id)
+                if parent_id:
+                    parents[folder_id] = parent_id
+                modified = _watermark(folder.get("modifiedTime"))
+                if modified is not None and watermarks.get(folder_id) == modified:
+                    totals["skipped"] += 1
+                    _report(progress, "skipped", pending=len(in_flight))
+                    return
+                listing = _FolderListing(folder_id, ready)
+                in_flight[folder_id] = (listing, depth, modified)
+                pool.submit(listing.produce)
+
+            try:
+                for f in folders:
+                    enqueue(f, 1, None)
+
+                while in_flight:
+                    listing = ready.get()
+                    folder_id = listing.folder_id
+                    _, depth, modified = in_flight[folder_id]
+                    descend = depth < max_depth
+                    try:
+                        result = _apply_folder(session, folder_id, listing)
+                    except Exception as e:
+                        if listing.error is None:
+                            raise
+                        # One bad folder must not abort the run; drop its partial pages
+                        session.rollback()
+                        del in_flight[folder_id]
+                        logger.warning("sync_root: skipping folder %s (depth %d): %s", folder_id, depth, e)
+                        node = folder_id
+                        failed.add(node)
+                        while node in parents:
+                            node = parents[node]
+                            failed.add(node)
+                        _report(progress, "error", folder_id=folder_id, message=str(e), pending=len(in_flight))
+                        continue
+                    del in_flight[folder_id]
+
+                    album_tree.invalidate()
+                    if descend and modified is not None:
+                        listed[folder_id] = modified
+                    totals["photos"] += result["photos_synced"]
+                    totals["folders"] += result["folders_synced"]
+                    totals["pages"] += result["pages"]
+                    totals["photos_removed"] += result["photos_removed"]
+                    totals["albums_removed"] += result["albums_removed"]
+                    level = depth_counts.setdefault(depth, {"folders": 0, "photos": 0})
+                    level["folders"] += 1
+                    level["photos"] += result["photos_synced"]
+
+                    if descend:
+                        for child in result["children"]:
+                            if child["id"] not in excluded:
+                                enqueue(child, depth + 1, folder_id)
+                    _report(progress, "folder", photos=result["photos_synced"], pending=len(in_flight))
+            finally:
+                # Unblock workers still waiting to hand over a page
+                for listing, _, _ in in_flight.values():
+                    listing.cancel()
+    except BaseException:
+        # Aborted mid-walk: no subtree entered this run is known complete, and
+        # a forced run may have entered folders whose old watermark still matches
+        session.rollback()
+        try:
+            album_repo.clear_watermarks(session, [*listed, *failed])
+        except Exception:
+            logger.exception("sync_root: could not clear watermarks after aborted traversal")
+        raise
+
+    # Post-order: subtrees are only complete now, and only where nothing failed
+    album_repo.clear_watermarks(session, list(failed))
+    album_repo.set_watermarks(
+        session, {folder_id: ts for folder_id, ts in listed.items() if folder_id not in failed}
+    )
+
+    if totals["revisits"]:
+        logger.info("sync_root: %d folders reached more than once (multi-parent or cycle)", totals["revisits"])
+    totals["depth_counts"] = {str(d): depth_counts[d] for d in sorted(depth_counts)}
+    return totals
+
+
+def sync_root(
+    session: Session,
+    incremental: bool = False,
+    force: bool = False,
+    progress: ProgressFn = None,
+) -> dict:
     """
     Full sync of root → child albums.
     - Upserts all root-level folders.
-    - For each root folder, does a shallow sync to get photos + sub-folders.
     - Applies section mappings.
-    - Does NOT recurse into sub-sub-folders (keep it bounded).
+    - Syncs each root folder and its descendants down to
+      settings.sync_max_depth levels, listing up to settings.sync_concurrency
+      folders at once.  Folders unchanged since they were last listed are
+      skipped with their subtree unless force=True.
+
+    With incremental=True and a stored Changes token, only the changes since
+    the last run are applied (see sync_incremental).
+    When nothing was synced the summary has skipped=True and a reason; it
+    also has failed=True when Drive was unreachable or not authenticated
+    (as opposed to there being nothing to do).
+    `progress` receives the events described at ProgressFn.
     Returns a summary.
     """
     root_id = settings.effective_root_folder
@@ -185,111 +565,277 @@ def sync_root(session: Session) -> dict:
         logger.warning("sync_root: no root folder configured, skipping")
         return {"skipped": True, "reason": "no root folder configured"}
 
+    if incremental:
+        state = sync_state_repo.get(session, root_id)
+        if state and state.changes_page_token:
+            try:
+                _report(progress, "stage", stage="incremental")
+                return _finish(
+                    session,
+                    sync_incremental(session, root_id, state.changes_page_token),
+                    progress,
+                )
+            except ChangesTokenInvalid as e:
+                logger.warning("sync_root: %s — falling back to full rescan", e)
+                # Changes since the token are lost; watermarks can't be trusted
+                force = True
+            except ReauthRequired:
+                logger.warning("sync_root: not authenticated, serving stale cache")
+                return {"skipped": True, "failed": True, "reason": "not authenticated"}
+            except DriveError as e:
+                logger.error("sync_root: Drive error: %s", e)
+                return {"skipped": True, "failed": True, "reason": str(e)}
+
     logger.info("sync_root: starting full Drive sync from root=%s", root_id)
+    _report(progress, "stage", stage="listing")
     now = _utcnow()
     total_folders = 0
     total_photos = 0
+    total_pages = 0
 
     try:
+        # Taken before the scan so changes made during it are replayed next time
+        start_token = get_changes_start_token()
         root_data = list_children(root_id)
     except ReauthRequired:
         logger.warning("sync_root: not authenticated, serving stale cache")
-        return {"skipped": True, "reason": "not authenticated"}
+        return {"skipped": True, "failed": True, "reason": "not authenticated"}
     except DriveError as e:
         logger.error("sync_root: Drive error: %s", e)
-        return {"skipped": True, "reason": str(e)}
+        return {"skipped": True, "failed": True, "reason": str(e)}
 
     # Upsert top-level album folders
     root_folders = root_data["folders"]
+    total_pages += root_data["pages"]
+    album_repo.bulk_upsert(session, [_album_row(f, None) for f in root_folders])
+    root_photos_removed, root_albums_removed = _tombstone_missing(
+        session, None, {f["id"] for f in root_folders}
+    )
+    session.commit()
     for f in root_folders:
-        modified = None
-        if f.get("modifiedTime"):
-            try:
-                modified = datetime.fromisoformat(f["modifiedTime"].replace("Z", "+00:00"))
-            except Exception:
-                pass
-        album = _upsert_album_from_drive(session, f["id"], f["name"], None, modified)
-        _apply_section_mapping(session, album)
+        album = album_repo.get_by_id(session, f["id"])
+        if album:
+            _apply_section_mapping(session, album)
         total_folders += 1
+    album_tree.invalidate()
 
-    # Shallow-sync each top-level album (get their photos + sub-folders)
-    synced_ids = {f["id"] for f in root_folders}
-    sub_folder_ids: list[str] = []
-    for f in root_folders:
-        try:
-            result = sync_folder_shallow(session, f["id"])
-            total_photos += result["photos_synced"]
-            total_folders += result["folders_synced"]
-            # Collect sub-folders so we can sync one level deeper
-            children = album_repo.get_by_parent(session, f["id"])
-            sub_folder_ids.extend(c.id for c in children)
-        except (ReauthRequired, DriveError) as e:
-            logger.warning("sync_root: skipping folder %s: %s", f["id"], e)
-
-    # Sync sub-albums (root → album → sub-album) so nested photos are loaded
-    sub_sub_folder_ids: list[str] = []
-    for sub_id in sub_folder_ids:
-        try:
-            result = sync_folder_shallow(session, sub_id)
-            total_photos += result["photos_synced"]
-            total_folders += result["folders_synced"]
-            # Collect one more level for deep structures like Videos/Arjun/...
-            grandchildren = album_repo.get_by_parent(session, sub_id)
-            sub_sub_folder_ids.extend(c.id for c in grandchildren)
-        except (ReauthRequired, DriveError) as e:
-            logger.warning("sync_root: skipping sub-folder %s: %s", sub_id, e)
-
-    # Sync one more level deep (root → album → sub-album → sub-sub-album)
-    # This covers structures like Videos/Arjun/2024/video.mp4
-    for sub_sub_id in sub_sub_folder_ids:
-        try:
-            result = sync_folder_shallow(session, sub_sub_id)
-            total_photos += result["photos_synced"]
-            total_folders += result["folders_synced"]
-        except (ReauthRequired, DriveError) as e:
-            logger.warning("sync_root: skipping sub-sub-folder %s: %s", sub_sub_id, e)
+    # Sync root → album → sub-album → ... (e.g. Videos/Arjun/2024/video.mp4),
+    # listing folders concurrently
+    max_depth = settings.sync_max_depth
+    totals = _traverse(session, root_id, root_folders, max_depth, force=force, progress=progress)
+    total_folders += totals["folders"]
+    total_photos += totals["photos"]
+    total_pages += totals["pages"]
 
     logger.info(
         "sync_root: done — %d folders, %d photos synced",
         total_folders,
         total_photos,
     )
-    return {
+    sync_state_repo.save_token(session, root_id, start_token, full=True)
+    return _finish(session, {
+        "mode": "full",
         "synced_at": now.isoformat(),
         "root_folders": len(root_folders),
         "total_folders": total_folders,
         "total_photos": total_photos,
+        "pages_fetched": total_pages,
+        "folders_skipped": totals["skipped"],
+        "photos_removed": totals["photos_removed"] + root_photos_removed,
+        "albums_removed": totals["albums_removed"] + root_albums_removed,
+        "forced": force,
+        "max_depth": max_depth,
+        "depth_counts": totals["depth_counts"],
+    }, progress)
+
+
+def purge_tombstones(session: Session, retention_days: int | None = None) -> dict:
+    """Hard-delete photos and albums tombstoned more than retention_days ago."""
+    days = settings.tombstone_retention_days if retention_days is None else retention_days
+    older_than = timedelta(days=days)
+    return {
+        "photos": photo_repo.purge_tombstones(session, older_than),
+        "albums": album_repo.purge_tombstones(session, older_than),
     }
 
 
-def maybe_sync_on_startup(session: Session) -> None:
+def _finish(session: Session, summary: dict, progress: ProgressFn = None) -> dict:
+    """Post-sync stages shared by full and incremental runs."""
+    _report(progress, "stage", stage="purging")
+    summary["purged"] = purge_tombstones(session)
+
+    _report(progress, "stage", stage="stats")
+    library_stats_repo.refresh(session)
+
+    _report(progress, "stage", stage="sections")
+    sections_service.rebuild_sections(session)
+
+    # Optional: pre-render thumbnails/previews
+    if settings.sync_warm_derivatives:
+        from services.derivative_warmer import warm_derivatives
+        _report(progress, "stage", stage="warming")
+        summary["warm"] = warm_derivatives(session)
+    return summary
+
+
+def _subtree_ids(session: Session, album_ids: list[str]) -> set[str]:
+    """album_ids plus every album nested beneath them."""
+    result: set[str] = set()
+    stack = list(album_ids)
+    while stack:
+        album_id = stack.pop()
+        if album_id in result:
+            continue
+        result.add(album_id)
+        stack.extend(
+            c.id for c in album_repo.get_by_parent(session, album_id, include_excluded=True)
+        )
+    return result
+
+
+def sync_incremental(session: Session, root_id: str, page_token: str) -> dict:
     """
-    Called at app startup. Runs a full sync only if:
+    Apply Drive changes since page_token to albums/photos.
+
+    Only items inside the synced tree matter: a folder is tracked when its
+    parent is the root or an already-known album, and a photo when its parent
+    is a known album.  Items removed, trashed, or moved out of the tree are
+    tombstoned.  Raises ChangesTokenInvalid when a rescan is needed.
+    """
+    now = _utcnow()
+    changes, new_token = list_changes(page_token)
+
+    known = album_repo.get_all_ids(session)
+    touched_folders: set[str] = set()
+    removed_photos: list[str] = []
+    removed_albums: list[str] = []
+    folders: list[dict] = []
+    files: list[dict] = []
+
+    for c in changes:
+        f = c["file"]
+        if c["removed"] or not f or f.get("trashed"):
+            removed_photos.append(c["file_id"])
+            if c["file_id"] in known:
+                removed_albums.append(c["file_id"])
+        elif f.get("mimeType") == FOLDER_MIME:
+            folders.append(f)
+        elif f.get("mimeType", "").startswith(("image/", "video/")):
+            files.append(f)
+
+    # Folders first, repeating until no more attach: a new parent and its new
+    # child may arrive in either order within one batch.
+    albums_upserted = 0
+    pending = folders
+    while pending:
+        unresolved = []
+        for f in pending:
+            parents = f.get("parents") or []
+            if root_id in parents:
+                parent_id = None
+            else:
+                parent_id = next((p for p in parents if p in known), "")
+            if parent_id == "":
+                unresolved.append(f)
+                continue
+            album = _upsert_album_from_drive(
+                session, f["id"], f.get("name", ""), parent_id,
+                _parse_drive_time(f.get("modifiedTime")),
+            )
+            if parent_id is None:
+                _apply_section_mapping(session, album)
+            else:
+                touched_folders.add(parent_id)
+            known.add(f["id"])
+            albums_upserted += 1
+        if len(unresolved) == len(pending):
+            # Whatever is left lives outside our tree (or was moved out of it)
+            removed_albums.extend(f["id"] for f in unresolved if f["id"] in known)
+            break
+        pending = unresolved
+
+    # Changed photos are written in one bulk upsert, like a folder listing
+    photo_rows: dict[str, dict] = {}
+    for f in files:
+        parent_id = next((p for p in f.get("parents") or [] if p in known), None)
+        if parent_id is None:
+            removed_photos.append(f["id"])
+            continue
+        photo_rows[f["id"]] = _photo_row(normalize_file(f), parent_id)
+        touched_folders.add(parent_id)
+    photos_upserted = photo_repo.bulk_upsert(session, list(photo_rows.values()))
+
+    # Removing a folder removes everything beneath it (Drive trashes children
+    # implicitly, without a change record per child)
+    removed_tree = _subtree_ids(session, removed_albums)
+    for album_id in removed_albums:
+        album = album_repo.get_by_id(session, album_id)
+        if album and album.parent_id:
+            touched_folders.add(album.parent_id)
+    gone = [p for p in (photo_repo.get_by_id(session, pid) for pid in set(removed_photos)) if p]
+    touched_folders.update(p.parent_folder_id for p in gone if p.parent_folder_id)
+    photos_removed, albums_removed = _tombstone(session, {p.id for p in gone}, set(removed_albums))
+    touched_folders -= removed_tree
+
+    # Keep per-album counts and covers in step with what changed
+    for folder_id in touched_folders:
+        album = album_repo.get_by_id(session, folder_id)
+        if album:
+            album.photo_count = photo_repo.count_by_folder(session, folder_id)
+            album.child_count = len(album_repo.get_by_parent(session, folder_id, include_excluded=True))
+            _refresh_cover(session, album)
+            album.last_synced = now
+            session.add(album)
+    session.commit()
+    album_tree.invalidate()
+
+    sync_state_repo.save_token(session, root_id, new_token, full=False)
+    logger.info(
+        "sync_incremental: %d changes — %d albums, %d photos upserted; %d albums, %d photos removed",
+        len(changes), albums_upserted, photos_upserted, albums_removed, photos_removed,
+    )
+    return {
+        "mode": "incremental",
+        "synced_at": now.isoformat(),
+        "changes": len(changes),
+        "albums_upserted": albums_upserted,
+        "photos_upserted": photos_upserted,
+        "albums_removed": albums_removed,
+        "photos_removed": photos_removed,
+    }
+
+
+def maybe_sync_on_startup(session: Session, progress: ProgressFn = None) -> dict:
+    """
+    Runs a sync only if:
     - There are no root albums in DB (first run), OR
     - The most recently synced root album is older than SYNC_STALE_SECONDS.
 
     This avoids expensive Drive reads on every restart while keeping data fresh.
+    The app runs it as a background sync job (services/sync_jobs.py), so
+    startup does not wait for it.  Returns the sync summary.
     """
     root_albums = album_repo.get_root_albums(session)
 
     if not root_albums:
         logger.info("maybe_sync_on_startup: no albums in DB, running initial sync")
-        sync_root(session)
-        return
+        return sync_root(session, progress=progress)
 
-    most_recent_sync = max(
-        (a.last_synced for a in root_albums if a.last_synced),
-        default=None,
-    )
+    state = sync_state_repo.get(session, settings.effective_root_folder)
+    candidates = [a.last_synced for a in root_albums if a.last_synced]
+    if state:
+        candidates += [t for t in (state.last_full_sync, state.last_incremental_sync) if t]
+    most_recent_sync = max(candidates, default=None)
 
     if _is_stale(most_recent_sync):
         logger.info(
             "maybe_sync_on_startup: last sync=%s is stale, re-syncing",
             most_recent_sync,
         )
-        sync_root(session)
-    else:
-        logger.info(
-            "maybe_sync_on_startup: last sync=%s is fresh, skipping",
-            most_recent_sync,
-        )
+        return sync_root(session, incremental=True, progress=progress)
+
+    logger.info(
+        "maybe_sync_on_startup: last sync=%s is fresh, skipping",
+        most_recent_sync,
+    )
+    return {"skipped": True, "reason": "fresh"}